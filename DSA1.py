@@ -1,289 +1,2242 @@
-import tkinter as tk  # Import the tkinter library for creating the graphical user interface (GUI)
-from tkinter import simpledialog, messagebox, filedialog  # Import specific functions for dialogs and file operations
-import random  # Import the random library to generate random numbers
-import csv  # Import the csv library to read and write CSV files
-import os  # Import the os library to interact with the operating system
-
-class QuestionBank:
-    def __init__(self):
-        # Initialize the QuestionBank object with empty data structures
-        self.questions = {}  # A dictionary to store questions by their unique IDs
-        self.topics = {}  # A dictionary to keep track of which question IDs are associated with each topic
-        self.difficulty_levels = {}  # A dictionary to keep track of which question IDs are associated with each difficulty level
-
-    def add_question(self, question_id, question, topic, difficulty):
-        # Add a new question to the question bank
-        self.questions[question_id] = {'question': question, 'topic': topic, 'difficulty': difficulty}
-
-        # Update the topics dictionary to include the new question ID
-        if topic not in self.topics:
-            self.topics[topic] = set()  # Create a new set for this topic if it does not exist
-        self.topics[topic].add(question_id)  # Add the question ID to the set for this topic
-
-        # Update the difficulty_levels dictionary to include the new question ID
-        if difficulty not in self.difficulty_levels:
-            self.difficulty_levels[difficulty] = set()  # Create a new set for this difficulty level if it does not exist
-        self.difficulty_levels[difficulty].add(question_id)  # Add the question ID to the set for this difficulty level
-
-    def update_question(self, question_id, question=None, topic=None, difficulty=None):
-        # Update an existing question's details
-        if question_id in self.questions:
-            if question:
-                self.questions[question_id]['question'] = question  # Update the question text if a new one is provided
-            if topic:
-                old_topic = self.questions[question_id]['topic']
-                # Remove the question from the old topic and add it to the new topic
-                self.topics[old_topic].remove(question_id)
-                if topic not in self.topics:
-                    self.topics[topic] = set()  # Create a new set for the new topic if it does not exist
-                self.topics[topic].add(question_id)  # Add the question ID to the set for the new topic
-                self.questions[question_id]['topic'] = topic  # Update the topic for the question
-            if difficulty:
-                old_difficulty = self.questions[question_id]['difficulty']
-                # Remove the question from the old difficulty level and add it to the new difficulty level
-                self.difficulty_levels[old_difficulty].remove(question_id)
-                if difficulty not in self.difficulty_levels:
-                    self.difficulty_levels[difficulty] = set()  # Create a new set for the new difficulty level if it does not exist
-                self.difficulty_levels[difficulty].add(question_id)  # Add the question ID to the set for the new difficulty level
-                self.questions[question_id]['difficulty'] = difficulty  # Update the difficulty for the question
-        else:
-            print("Question not found.")  # Print a message if the question ID does not exist
-
-    def search_questions(self, topics=None, difficulty_range=None):
-        # Search for questions based on provided topics and difficulty levels
-        result_ids = set(self.questions.keys())  # Start with all question IDs
-
-        if topics:
-            topic_ids = set()
-            for topic in topics:
-                topic_ids |= self.topics.get(topic, set())  # Combine all question IDs for the provided topics
-            result_ids &= topic_ids  # Keep only those question IDs that are in the set of topic IDs
-
-        if difficulty_range:
-            difficulty_ids = set()
-            for difficulty in difficulty_range:
-                difficulty_ids |= self.difficulty_levels.get(difficulty, set())  # Combine all question IDs for the provided difficulties
-            result_ids &= difficulty_ids  # Keep only those question IDs that are in the set of difficulty IDs
-
-        return [self.questions[q_id] for q_id in result_ids]  # Return the details of the matching questions
-
-    def delete_question(self, question_id):
-        # Delete a question from the question bank
-        if question_id in self.questions:
-            question_info = self.questions.pop(question_id)  # Remove the question from the dictionary
-            self.topics[question_info['topic']].remove(question_id)  # Remove the question ID from the topic set
-            self.difficulty_levels[question_info['difficulty']].remove(question_id)  # Remove the question ID from the difficulty level set
-            print(f"Question {question_id} deleted.")  # Print a message confirming deletion
-        else:
-            print("Question not found.")  # Print a message if the question ID does not exist
-
-    def random_question(self, topic=None, difficulty=None):
-        # Retrieve a random question based on optional topic and difficulty filters
-        candidates = set(self.questions.keys())  # Start with all question IDs
-        if topic:
-            candidates &= self.topics.get(topic, set())  # Filter by the specified topic
-        if difficulty:
-            candidates &= self.difficulty_levels.get(difficulty, set())  # Filter by the specified difficulty
-
-        if candidates:
-            random_id = random.choice(list(candidates))  # Choose a random question ID from the filtered list
-            return self.questions[random_id]  # Return the details of the selected question
-        else:
-            return None  # Return None if no questions match the filters
-
-    def statistics(self):
-        # Generate statistics about the question bank
-        total_questions = len(self.questions)  # Count the total number of questions
-        topic_distribution = {topic: len(ids) for topic, ids in self.topics.items()}  # Count questions per topic
-        difficulty_distribution = {difficulty: len(ids) for difficulty, ids in self.difficulty_levels.items()}  # Count questions per difficulty level
-        return {
-            "total_questions": total_questions,  # Total number of questions
-            "topic_distribution": topic_distribution,  # Distribution of questions by topic
-            "difficulty_distribution": difficulty_distribution  # Distribution of questions by difficulty level
-        }
-
-    def save_to_file(self, filename):
-        # Save all questions to a CSV file
-        with open(filename, 'w', newline='') as file:  # Open the file in write mode
-            writer = csv.writer(file)  # Create a CSV writer object
-            writer.writerow(['ID', 'Question', 'Topic', 'Difficulty'])  # Write the header row
-            for q_id, question in self.questions.items():
-                # Write each question's details to the file
-                writer.writerow([q_id, question['question'], question['topic'], question['difficulty']])
-
-    def load_from_file(self, filename):
-        # Load questions from a CSV file
-        with open(filename, 'r', newline='') as file:  # Open the file in read mode
-            reader = csv.reader(file)  # Create a CSV reader object
-            next(reader)  # Skip the header row
-            self.questions.clear()  # Clear the existing questions
-            self.topics.clear()  # Clear the existing topics
-            self.difficulty_levels.clear()  # Clear the existing difficulty levels
-            for row in reader:
-                q_id = int(row[0])  # Convert the ID to an integer
-                question, topic, difficulty = row[1], row[2], row[3]  # Extract question details
-                self.add_question(q_id, question, topic, difficulty)  # Add each question to the question bank
-
-class QuestionBankGUI:
-    def __init__(self, master, question_bank):
-        self.master = master  # Reference to the main window
-        self.question_bank = question_bank  # Reference to the QuestionBank instance
-        
-        self.master.geometry("900x600")  # Set the size of the window
-        self.master.title("Question Bank Management")  # Set the title of the window
-        self.master.configure(bg="#eaeaea")  # Set the background color of the window
-
-        # Define colors for various UI elements
-        self.primary_color = "#1abc9c"    # Bright teal color for primary elements
-        self.secondary_color = "#34495e"  # Dark blue-gray color for secondary elements
-        self.accent_color = "#e74c3c"     # Vivid red color for accents
-        self.button_color = "#3498db"     # Bright blue color for buttons
-        self.button_text_color = "#ffffff"  # White text color for buttons
-        self.listbox_bg = "#ffffff"       # White background for the listbox
-        self.listbox_fg = "#2c3e50"       # Dark text color for the listbox
-
-        # Create and place frames within the main window
-        self.main_frame = tk.Frame(master, bg=self.primary_color, padx=20, pady=20)
-        self.main_frame.pack(pady=20, fill=tk.BOTH, expand=True)  # Pack the main frame with padding and expand to fill available space
-
-        self.button_frame = tk.Frame(self.main_frame, bg=self.secondary_color, padx=10, pady=10)
-        self.button_frame.pack(pady=10, fill=tk.X)  # Pack the button frame with padding and fill horizontally
-
-        self.list_frame = tk.Frame(self.main_frame, bg=self.primary_color, padx=10, pady=10)
-        self.list_frame.pack(pady=10, fill=tk.BOTH, expand=True)  # Pack the list frame with padding and expand to fill available space
-
-        # Create buttons with improved styles and add them to the button frame
-        self.create_button("Delete Question", self.delete_question_prompt).grid(row=0, column=0, padx=10, pady=5, sticky="ew")
-        self.create_button("Add Question", self.add_question).grid(row=0, column=1, padx=10, pady=5, sticky="ew")
-        self.create_button("Update Question", self.update_question_prompt).grid(row=0, column=2, padx=10, pady=5, sticky="ew")
-        self.create_button("Search Question", self.search_question_prompt).grid(row=1, column=0, padx=10, pady=5, sticky="ew")
-        self.create_button("Random Question", self.random_question_prompt).grid(row=1, column=1, padx=10, pady=5, sticky="ew")
-        self.create_button("Statistics", self.show_statistics).grid(row=1, column=2, padx=10, pady=5, sticky="ew")
-        self.create_button("Save", self.save_questions).grid(row=2, column=0, padx=10, pady=5, sticky="ew")
-        self.create_button("Load", self.load_questions).grid(row=2, column=1, padx=10, pady=5, sticky="ew")
-
-        # Create a Listbox with a scrollbar to display the list of questions
-        self.questions_list = tk.Listbox(self.list_frame, bg=self.listbox_bg, fg=self.listbox_fg, font=("Helvetica", 12), selectbackground=self.accent_color, selectforeground=self.listbox_bg)
-        self.scrollbar = tk.Scrollbar(self.list_frame, orient=tk.VERTICAL, command=self.questions_list.yview)
-        self.questions_list.config(yscrollcommand=self.scrollbar.set)
-        
-        self.questions_list.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)  # Pack the listbox to the left side
-        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)  # Pack the scrollbar to the right side
-
-        self.refresh_questions()  # Refresh the listbox with the current questions
-
-    def create_button(self, text, command):
-        # Create a button with the specified text and command
-        return tk.Button(self.button_frame, text=text, command=command, width=20, bg=self.button_color, fg=self.button_text_color, font=("Helvetica", 12, "bold"), relief="raised", borderwidth=2)
-
-    def update_question_prompt(self):
-        # Prompt the user to update an existing question
-        question_id = simpledialog.askinteger("Input", "Enter the question ID to update:")  # Ask for the question ID
-        if question_id in self.question_bank.questions:
-            question = simpledialog.askstring("Input", "Enter the new question text (leave blank to keep current):")  # Ask for new question text
-            topic = simpledialog.askstring("Input", "Enter the new topic (leave blank to keep current):")  # Ask for new topic
-            difficulty = simpledialog.askstring("Input", "Enter the new difficulty (leave blank to keep current):")  # Ask for new difficulty level
-            self.question_bank.update_question(question_id, question, topic, difficulty)  # Update the question in the bank
-            self.refresh_questions()  # Refresh the listbox to show updated questions
-            messagebox.showinfo("Success", f"Question {question_id} updated.")  # Show a success message
-        else:
-            messagebox.showerror("Error", "Question ID not found.")  # Show an error message if the ID is not found
-
-    def search_question_prompt(self):
-        # Prompt the user to search for questions based on topic and difficulty
-        topics = simpledialog.askstring("Input", "Enter topics to search (comma-separated, leave blank if not searching by topic):")  # Ask for topics
-        difficulty_range = simpledialog.askstring("Input", "Enter difficulty levels to search (comma-separated, leave blank if not searching by difficulty):")  # Ask for difficulty levels
-
-        if topics:
-            topics = [topic.strip() for topic in topics.split(",")]  # Split and strip the topic list
-        else:
-            topics = None  # If no topics are provided, set to None
-
-        if difficulty_range:
-            difficulty_range = [difficulty.strip() for difficulty in difficulty_range.split(",")]  # Split and strip the difficulty list
-        else:
-            difficulty_range = None  # If no difficulty levels are provided, set to None
-
-        results = self.question_bank.search_questions(topics=topics, difficulty_range=difficulty_range)  # Search for questions
-        if results:
-            result_text = "\n".join([f"Question: {q['question']}, Topic: {q['topic']}, Difficulty: {q['difficulty']}" for q in results])  # Format the results
-            messagebox.showinfo("Search Results", result_text)  # Show the search results in a message box
-        else:
-            messagebox.showinfo("Search Results", "No matching questions found.")  # Show a message if no results are found
-
-    def random_question_prompt(self):
-        # Prompt the user to get a random question based on optional filters
-        topic = simpledialog.askstring("Input", "Enter the topic (leave blank for any topic):")  # Ask for a topic
-        difficulty = simpledialog.askstring("Input", "Enter the difficulty level (leave blank for any difficulty):")  # Ask for a difficulty level
-
-        question = self.question_bank.random_question(topic=topic, difficulty=difficulty)  # Get a random question
-        if question:
-            messagebox.showinfo("Random Question", f"Question: {question['question']}, Topic: {question['topic']}, Difficulty: {question['difficulty']}")  # Show the random question
-        else:
-            messagebox.showinfo("Random Question", "No matching questions found.")  # Show a message if no questions match
-
-    def show_statistics(self):
-        # Show statistics about the question bank
-        stats = self.question_bank.statistics()  # Get the statistics
-        stats_text = f"Total Questions: {stats['total_questions']}\n"  # Format the total number of questions
-        stats_text += "Topic Distribution:\n"
-        for topic, count in stats['topic_distribution'].items():
-            stats_text += f"  {topic}: {count}\n"  # Format the distribution of questions by topic
-        stats_text += "Difficulty Distribution:\n"
-        for difficulty, count in stats['difficulty_distribution'].items():
-            stats_text += f"  {difficulty}: {count}\n"  # Format the distribution of questions by difficulty
-        messagebox.showinfo("Statistics", stats_text)  # Show the statistics in a message box
-
-    def save_questions(self):
-        # Save all questions to a CSV file
-        filename = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV files", "*.csv")], title="Save as")  # Ask for a filename to save
-        if filename:
-            self.question_bank.save_to_file(filename)  # Save the questions to the specified file
-            messagebox.showinfo("Success", f"Questions saved successfully to {filename}.")  # Show a success message
-        else:
-            messagebox.showerror("Error", "Filename cannot be empty.")  # Show an error message if the filename is empty
-
-    def load_questions(self):
-        # Load questions from a CSV file
-        filename = filedialog.askopenfilename(filetypes=[("CSV files", "*.csv")], title="Open file")  # Ask for a filename to open
-        if filename:
-            if os.path.exists(filename):
-                self.question_bank.load_from_file(filename)  # Load the questions from the specified file
-                self.refresh_questions()  # Refresh the listbox to show the loaded questions
-                messagebox.showinfo("Success", f"Questions loaded successfully from {filename}.")  # Show a success message
-            else:
-                messagebox.showerror("Error", "File not found.")  # Show an error message if the file does not exist
-        else:
-            messagebox.showerror("Error", "Filename cannot be empty.")  # Show an error message if the filename is empty
-
-    def refresh_questions(self):
-        # Update the listbox to display the current questions
-        self.questions_list.delete(0, tk.END)  # Clear the listbox
-        for q_id, question in self.question_bank.questions.items():
-            # Insert each question's details into the listbox
-            self.questions_list.insert(tk.END, f"ID: {q_id}, Question: {question['question']}, Topic: {question['topic']}, Difficulty: {question['difficulty']}")
-
-    def add_question(self):
-        # Prompt the user to add a new question
-        question = simpledialog.askstring("Input", "Enter the question:")  # Ask for the question text
-        topic = simpledialog.askstring("Input", "Enter the topic:")  # Ask for the topic
-        difficulty = simpledialog.askstring("Input", "Enter the difficulty level:")  # Ask for the difficulty level
-        question_id = len(self.question_bank.questions) + 1  # Generate a new ID for the question
-        self.question_bank.add_question(question_id, question, topic, difficulty)  # Add the new question to the question bank
-        self.refresh_questions()  # Refresh the listbox to show the new question
-
-    def delete_question_prompt(self):
-        # Prompt the user to delete a question
-        question_id = simpledialog.askinteger("Input", "Enter the question ID to delete:")  # Ask for the question ID
-        if question_id in self.question_bank.questions:
-            self.question_bank.delete_question(question_id)  # Delete the question from the bank
-            self.refresh_questions()  # Refresh the listbox to reflect the deletion
-            messagebox.showinfo("Success", f"Question {question_id} deleted.")  # Show a success message
-        else:
-            messagebox.showerror("Error", "Question ID not found.")  # Show an error message if the ID is not found
-
-if __name__ == "__main__":
-    root = tk.Tk()  # Create the main application window
-    question_bank = QuestionBank()  # Create a QuestionBank instance
-    app = QuestionBankGUI(root, question_bank)  # Create the GUI with the question bank
-    root.mainloop()  # Start the main event loop to run the application
+import tkinter as tk  # Import the tkinter library for creating the graphical user interface (GUI)
+from tkinter import simpledialog, messagebox, filedialog  # Import specific functions for dialogs and file operations
+from tkinter import font as tkfont  # Import font metrics to work out how many rows fit in the list
+import threading  # Import threading to load files without freezing the window
+import queue  # Import queue to pass progress from the loading thread to the window
+import random  # Import the random library to generate random numbers
+import csv  # Import the csv library to read and write CSV files
+import os  # Import the os library to interact with the operating system
+import json  # Import the json library to encode change journal records
+import re  # Import regular expressions to split question text into words
+import math  # Import math for the logarithms used in search ranking
+import heapq  # Import heapq to pick the best-ranked search results without sorting them all
+import mmap  # Import mmap so binary snapshots are read lazily from the operating system's page cache
+import struct  # Import struct to encode the binary snapshot header
+import sys  # Import sys to check the machine's byte order for binary snapshots
+import time  # Import time to measure method latencies when instrumentation is enabled
+import functools  # Import functools to keep method names on instrumentation wrappers
+import zlib  # Import zlib for a string hash that is the same in every worker process
+from concurrent.futures import ProcessPoolExecutor  # Import a process pool to compute duplicate signatures in parallel
+import bisect  # Import bisect to pick weighted buckets from cumulative totals
+import operator  # Import operator for the small key functions used when grouping buckets
+from array import array  # Import typed arrays for compact columnar storage
+from collections import Counter, OrderedDict, defaultdict, deque  # Import Counter to find repeated IDs and OrderedDict to keep cached search results in least-recently-used order; defaultdict and deque group words in bulk
+from collections.abc import MutableMapping  # Import the mapping base class so the columnar store behaves like a dictionary
+from itertools import chain, islice, repeat  # Import chain to join bucket lists without copying them first, islice to cut batches and repeat for pool arguments
+
+class ColumnarQuestionStore(MutableMapping):
+    # A dictionary-like store that keeps every question in a few typed columns instead of one dict per question.
+    # Topic and difficulty strings are interned into small integer codes, and question text is packed into a
+    # single UTF-8 buffer addressed by offsets, so the per-question overhead is a handful of bytes.
+    NO_TEXT = 0xFFFFFFFF  # Length marker for questions whose text is None
+    COMPACT_MIN_ROWS = 1024  # Do not bother compacting tiny stores
+
+    def __init__(self):
+        self._row_of = {}  # Maps each question ID to its row number in the columns
+        self._base = b""  # Read-only packed text from a binary snapshot (an mmap), read only when a row is accessed
+        self._base_offset = 0  # Where the packed text starts inside _base
+        self._base_size = 0  # Number of text bytes in _base; text offsets below this point into _base
+        self._base_path = None  # Absolute path of the snapshot file mapped as _base, if any
+        self._text = bytearray()  # Packed UTF-8 text added since the store was created or opened
+        self._text_start = array('Q')  # Offset of each row's text in the packed buffer
+        self._text_length = array('I')  # Length in bytes of each row's text
+        self._topic_codes = array('I')  # Interned topic code of each row
+        self._difficulty_codes = array('I')  # Interned difficulty code of each row
+        self._topic_names = []  # Maps each topic code back to its string
+        self._topic_lookup = {}  # Maps each topic string to its code
+        self._difficulty_names = []  # Maps each difficulty code back to its string
+        self._difficulty_lookup = {}  # Maps each difficulty string to its code
+        self._dead_rows = 0  # Number of rows left behind by deletions
+        self._dead_bytes = 0  # Number of text bytes no longer referenced by any row
+
+    @staticmethod
+    def _intern(names, lookup, value):
+        # Return the code for a topic or difficulty string, assigning a new one the first time it is seen
+        code = lookup.get(value)
+        if code is None:
+            code = len(names)  # Codes are handed out in order of first appearance
+            names.append(value)
+            lookup[value] = code
+        return code
+
+    def _append_text(self, row, question):
+        # Store the question text for a row at the end of the packed buffer
+        if question is None:
+            self._text_start[row] = 0
+            self._text_length[row] = self.NO_TEXT  # Remember that the text is None rather than empty
+            return
+        encoded = question.encode('utf-8')
+        self._text_start[row] = self._base_size + len(self._text)
+        self._text_length[row] = len(encoded)
+        self._text += encoded
+
+    def _read_text(self, row):
+        # Decode the question text stored for a row
+        length = self._text_length[row]
+        if length == self.NO_TEXT:
+            return None
+        return self._raw_text(self._text_start[row], length).decode('utf-8')
+
+    def _raw_text(self, start, length):
+        # Bytes of packed text at an offset, from the snapshot or from the in-memory buffer
+        if start >= self._base_size:
+            start -= self._base_size
+            return self._text[start:start + length]
+        start += self._base_offset
+        return self._base[start:start + length]
+
+    def _stored_bytes(self, row):
+        # Number of packed text bytes owned by a row
+        length = self._text_length[row]
+        return 0 if length == self.NO_TEXT else length
+
+    def __getitem__(self, question_id):
+        # Rebuild the familiar question dictionary from the columns
+        row = self._row_of[question_id]
+        return {
+            'question': self._read_text(row),
+            'topic': self._topic_names[self._topic_codes[row]],
+            'difficulty': self._difficulty_names[self._difficulty_codes[row]],
+        }
+
+    def __setitem__(self, question_id, details):
+        # Store a question dictionary in the columns, reusing the existing row when the ID is already present
+        topic_code = self._intern(self._topic_names, self._topic_lookup, details['topic'])
+        difficulty_code = self._intern(self._difficulty_names, self._difficulty_lookup, details['difficulty'])
+        row = self._row_of.get(question_id)
+        if row is None:
+            row = len(self._topic_codes)  # New questions always go into a fresh row at the end
+            self._text_start.append(0)
+            self._text_length.append(0)
+            self._topic_codes.append(topic_code)
+            self._difficulty_codes.append(difficulty_code)
+            self._row_of[question_id] = row
+            self._append_text(row, details['question'])
+            return
+        self._topic_codes[row] = topic_code
+        self._difficulty_codes[row] = difficulty_code
+        if self._read_text(row) != details['question']:
+            self._dead_bytes += self._stored_bytes(row)  # The old text stays in the buffer until the next compaction
+            self._append_text(row, details['question'])
+            self._maybe_compact()
+
+    def __delitem__(self, question_id):
+        # Forget a question; its row and text are reclaimed by a later compaction
+        row = self._row_of.pop(question_id)
+        self._dead_rows += 1
+        self._dead_bytes += self._stored_bytes(row)
+        self._maybe_compact()
+
+    def __iter__(self):
+        # Iterate over question IDs in insertion order, like a dictionary
+        return iter(self._row_of)
+
+    def __len__(self):
+        # Number of questions currently stored
+        return len(self._row_of)
+
+    def __contains__(self, question_id):
+        # Membership test without rebuilding the question dictionary
+        return question_id in self._row_of
+
+    def clear(self):
+        # Drop every question at once instead of deleting them one by one
+        self.__init__()
+
+    @classmethod
+    def from_snapshot(cls, snapshot, ids):
+        # Open the columns of a BinarySnapshot; question text stays in the memory-mapped file until it is read
+        store = cls()
+        store._row_of = dict(zip(ids, range(len(ids))))
+        store._text_start = snapshot.array("text_start", 'Q')
+        store._text_length = snapshot.array("text_length", 'I')
+        store._topic_codes = snapshot.array("topic_codes", 'I')
+        store._difficulty_codes = snapshot.array("difficulty_codes", 'I')
+        store._topic_names = snapshot.names("topic_names")
+        store._topic_lookup = {name: code for code, name in enumerate(store._topic_names)}
+        store._difficulty_names = snapshot.names("difficulty_names")
+        store._difficulty_lookup = {name: code for code, name in enumerate(store._difficulty_names)}
+        store._base = snapshot.mapping
+        store._base_offset, store._base_size = snapshot.sections["text"]
+        store._base_path = os.path.abspath(snapshot.filename)
+        return store
+
+    def release_file(self, filename):
+        # Stop using filename if it is the mapped snapshot: copy its text into memory and close the mapping
+        # Windows refuses to replace a file that is still mapped, so this is called before a save overwrites it.
+        if self._base_path is None or self._base_path != os.path.abspath(filename):
+            return
+        start = self._base_offset
+        self._text = bytearray(self._base[start:start + self._base_size]) + self._text  # Offsets stay valid with no base
+        mapping = self._base
+        self._base, self._base_offset, self._base_size, self._base_path = b"", 0, 0, None
+        mapping.close()
+
+    def _maybe_compact(self):
+        # Rewrite the columns once more than half of the rows or text bytes are garbage
+        live_rows = len(self._row_of)
+        text_size = self._base_size + len(self._text)
+        if self._dead_rows > max(live_rows, self.COMPACT_MIN_ROWS) or self._dead_bytes > max(text_size // 2, self.COMPACT_MIN_ROWS * 64):
+            self.compact()
+
+    def compact(self):
+        # Copy the live rows into fresh columns, dropping deleted rows and unreferenced text
+        text = bytearray()
+        text_start, text_length = array('Q'), array('I')
+        topic_codes, difficulty_codes = array('I'), array('I')
+        row_of = {}
+        for question_id, row in self._row_of.items():
+            length = self._text_length[row]
+            start = self._text_start[row]
+            text_start.append(len(text))
+            text_length.append(length)
+            if length != self.NO_TEXT:
+                text += self._raw_text(start, length)
+            topic_codes.append(self._topic_codes[row])
+            difficulty_codes.append(self._difficulty_codes[row])
+            row_of[question_id] = len(topic_codes) - 1
+        self._row_of = row_of
+        self._base, self._base_offset, self._base_size = b"", 0, 0  # Everything now lives in memory
+        self._base_path = None
+        self._text, self._text_start, self._text_length = text, text_start, text_length
+        self._topic_codes, self._difficulty_codes = topic_codes, difficulty_codes
+        self._dead_rows = 0
+        self._dead_bytes = 0
+
+class ChangeJournal:
+    # An append-only write-ahead log of question changes kept next to a saved snapshot.
+    # Every add, update and delete becomes one JSON line, so saving costs as much as the changes themselves.
+    # fsync_policy decides durability: "always" syncs after every change, "batch" writes and syncs every
+    # batch_size changes, and "never" leaves syncing to the operating system. Saving always writes pending changes.
+    FSYNC_POLICIES = ("always", "batch", "never")
+
+    def __init__(self, fsync_policy="batch", batch_size=100, compact_ratio=1.0, compact_min=1000):
+        if fsync_policy not in self.FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy: {fsync_policy}")
+        self.fsync_policy = fsync_policy  # How eagerly logged changes are forced to disk
+        self.batch_size = batch_size  # Number of changes buffered before a write under the "batch" and "never" policies
+        self.compact_ratio = compact_ratio  # Compact on save once the journal holds this many records per question
+        self.compact_min = compact_min  # ...but never before it holds at least this many records
+        self.path = None  # Path of the journal file, set once the bank has been saved or loaded
+        self.logged = 0  # Number of records already in the journal file
+        self._file = None  # Open journal file handle
+        self._pending = []  # Encoded records not yet written to the file
+
+    @staticmethod
+    def path_for(filename):
+        # The journal for a snapshot lives in a file next to it
+        return filename + ".journal"
+
+    @staticmethod
+    def read(path):
+        # Read every complete record from a journal file
+        # Returns the records and the byte length of the intact part; a torn last line from a crash is ignored
+        if not os.path.exists(path):
+            return [], 0
+        with open(path, 'rb') as file:
+            data = file.read()
+        records = []
+        valid_size = 0
+        for line in data.splitlines(keepends=True):
+            if not line.endswith(b"\n"):
+                break  # The last write was interrupted before its newline
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                break  # A damaged record ends the usable part of the journal
+            valid_size += len(line)
+        return records, valid_size
+
+    def attach(self, path, truncate=False, valid_size=None, logged=0):
+        # Start appending to the journal file at path, dropping anything not yet written for the previous file
+        self._pending = []  # Cleared before close so the old file does not receive them
+        self.close()
+        self.path = path
+        self._file = open(path, 'ab')
+        if truncate:
+            valid_size, logged = 0, 0
+        if valid_size is not None and self._file.tell() != valid_size:
+            self._file.truncate(valid_size)  # Cut off a torn record so new records start on a fresh line
+            self._file.seek(valid_size)
+        self.logged = logged
+        if truncate:
+            self._sync()
+
+    def record_put(self, question_id, details):
+        # Log the full current version of an added or updated question
+        self._append(self.put_record(question_id, details))
+
+    def record_delete(self, question_id):
+        # Log the deletion of a question
+        self._append({'op': 'delete', 'id': question_id})
+
+    @staticmethod
+    def put_record(question_id, details):
+        # Journal record for the current version of a question
+        return {'op': 'put', 'id': question_id, 'question': details['question'],
+                'topic': details['topic'], 'difficulty': details['difficulty']}
+
+    def record_batch(self, records):
+        # Log several records as one line, so a crash replays either all of them or none
+        if records:
+            self._append({'op': 'batch', 'records': records})
+
+    def _append(self, record):
+        # Queue a record and write it out according to the fsync policy
+        if self.path is None:
+            return  # Nothing has been saved yet, so the first save writes a full snapshot anyway
+        self._pending.append(json.dumps(record).encode('utf-8') + b"\n")
+        if self.fsync_policy == "always" or len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        # Write all queued records to the journal file and sync it unless the policy is "never"
+        if self._file is None:
+            return
+        if self._pending:
+            self._file.write(b"".join(self._pending))
+            self.logged += len(self._pending)
+            self._pending = []
+        self._sync()
+
+    def _sync(self):
+        # Push written records to the operating system, and to disk unless the policy is "never"
+        self._file.flush()
+        if self.fsync_policy != "never":
+            os.fsync(self._file.fileno())
+
+    def needs_compaction(self, question_count):
+        # True once replaying the journal would cost more than rewriting the snapshot
+        return self.logged + len(self._pending) > max(self.compact_min, question_count * self.compact_ratio)
+
+    def close(self):
+        # Write any queued records and close the journal file
+        if self._file is not None:
+            self.flush()
+            self._file.close()
+            self._file = None
+
+class TextIndex:
+    # An inverted index over question text for ranked keyword and phrase search.
+    # Each word maps to the questions containing it and how often it appears there, so a query only looks at
+    # the questions that share a word with it. Results are ranked with BM25.
+    TOKEN_PATTERN = re.compile(r"\w+")  # Words are runs of letters, digits and underscores
+    PHRASE_PATTERN = re.compile(r'"([^"]*)"')  # Phrases are written in double quotes
+    ASCII_WORDS = bytes(ord(chr(code).lower()) if chr(code).isalnum() or chr(code) == "_" else 0 if code == 0 else 32
+                        for code in range(256))  # Lowercases ASCII word characters, turns the rest into spaces, keeps NUL
+
+    def __init__(self, k1=1.2, b=0.75):
+        self.k1 = k1  # How quickly repeated words stop adding to the score
+        self.b = b  # How strongly long questions are penalised
+        self.postings = {}  # Maps each word to a dictionary of question ID -> number of occurrences
+        self.lengths = {}  # Maps each question ID to its number of words
+        self.total_length = 0  # Sum of all question lengths, for the average length
+
+    @classmethod
+    def tokenize(cls, text):
+        # Split text into lowercase words
+        if not text:
+            return []
+        return cls.TOKEN_PATTERN.findall(text.lower())
+
+    @classmethod
+    def tokenize_many(cls, texts):
+        # Split many texts into lowercase words, with the same result as tokenize on each one
+        # ASCII texts are joined with NUL separators and lowercased and split by one bytes.translate over the whole
+        # batch, which saves a regular expression call per text; any other text goes through tokenize.
+        texts = [text or "" for text in texts]
+        simple = [index for index, text in enumerate(texts) if text.isascii()]
+        joined = "\x00".join([texts[index] for index in simple])
+        if not simple or joined.count("\x00") != len(simple) - 1:  # A text containing NUL itself would shift the split
+            return [cls.tokenize(text) for text in texts]
+        parts = [part.split() for part in joined.encode("ascii").translate(cls.ASCII_WORDS).decode("ascii").split("\x00")]
+        if len(simple) == len(texts):
+            return parts
+        words = [None] * len(texts)
+        for index, part in zip(simple, parts):
+            words[index] = part
+        return [cls.tokenize(text) if part is None else part for text, part in zip(texts, words)]
+
+    def add(self, question_id, text):
+        # Index the words of a question
+        words = self.tokenize(text)
+        counts = {}
+        for word in words:
+            counts[word] = counts.get(word, 0) + 1
+        for word, count in counts.items():
+            if word not in self.postings:
+                self.postings[word] = {}
+            self.postings[word][question_id] = count
+        self.lengths[question_id] = len(words)
+        self.total_length += len(words)
+
+    def add_many(self, rows, chunk_size=50000):
+        # Index many (question_id, text) rows that are not indexed yet, a chunk at a time
+        # Every word occurrence in the chunk is grouped under its word and counted in C, then each word's
+        # postings are merged once per chunk, instead of updating the postings word by word for every row.
+        rows = iter(rows)
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                return
+            question_ids = [row[0] for row in chunk]
+            words = self.tokenize_many([row[1] for row in chunk])
+            lengths = list(map(len, words))
+            occurrences = defaultdict(list)  # Maps each word to one question ID per occurrence
+            deque(map(list.append, map(occurrences.__getitem__, chain.from_iterable(words)),
+                      chain.from_iterable(map(repeat, question_ids, lengths))), maxlen=0)  # Group without a Python-level loop
+            for word, ids in occurrences.items():
+                counts = dict(Counter(ids))
+                entries = self.postings.get(word)
+                if entries is None:
+                    self.postings[word] = counts
+                else:
+                    entries.update(counts)
+            self.lengths.update(zip(question_ids, lengths))
+            self.total_length += sum(lengths)
+
+    def remove(self, question_id, text):
+        # Drop the words of a question from the index; text must be the text it was indexed with
+        for word in set(self.tokenize(text)):
+            entries = self.postings[word]
+            del entries[question_id]
+            if not entries:
+                del self.postings[word]  # Forget words that no longer appear anywhere
+        self.total_length -= self.lengths.pop(question_id)
+
+    def clear(self):
+        # Empty the index
+        self.postings.clear()
+        self.lengths.clear()
+        self.total_length = 0
+
+    @classmethod
+    def parse_query(cls, query):
+        # Split a query into quoted phrases and loose keywords
+        phrases = [words for words in (cls.tokenize(phrase) for phrase in cls.PHRASE_PATTERN.findall(query)) if words]
+        keywords = cls.tokenize(cls.PHRASE_PATTERN.sub(" ", query))
+        return phrases, keywords
+
+    def search(self, query, text_of, k=10, allowed_ids=None):
+        # Return up to k (question ID, score) pairs, best first
+        # Questions must contain every phrase; keywords only add to the score. text_of(question_id) returns the
+        # question text and is used to check phrase word order. allowed_ids, when given, restricts the results.
+        phrases, keywords = self.parse_query(query)
+        if phrases:
+            candidates = None
+            for phrase in phrases:
+                matches = self._phrase_matches(phrase, text_of, candidates)
+                candidates = matches if candidates is None else candidates & matches
+                if not candidates:
+                    return []
+        else:
+            candidates = None  # Any question containing a keyword is a candidate
+        if allowed_ids is not None:
+            candidates = allowed_ids if candidates is None else candidates & allowed_ids
+
+        scores = {}
+        terms = set(keywords)
+        for phrase in phrases:
+            terms.update(phrase)  # Phrase words count towards the score as well
+        for word in terms:
+            self._score_word(word, scores, candidates)
+        if phrases:
+            for question_id in candidates:
+                scores.setdefault(question_id, 0.0)  # Phrase matches are results even when nothing else scores
+        return heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+
+    def _phrase_matches(self, phrase, text_of, candidates):
+        # Set of question IDs whose text contains the words of phrase in order
+        entries = [self.postings.get(word) for word in phrase]
+        if not all(entries):
+            return set()
+        entries.sort(key=len)  # Start from the rarest word and narrow down
+        matches = set(entries[0]) if candidates is None else {q_id for q_id in candidates if q_id in entries[0]}
+        for entry in entries[1:]:
+            matches = {q_id for q_id in matches if q_id in entry}
+        if len(phrase) == 1:
+            return matches
+        return {q_id for q_id in matches if self._contains_phrase(self.tokenize(text_of(q_id)), phrase)}
+
+    @staticmethod
+    def _contains_phrase(words, phrase):
+        # True if the word list contains the phrase words consecutively
+        width = len(phrase)
+        return any(words[i:i + width] == phrase for i in range(len(words) - width + 1))
+
+    def _score_word(self, word, scores, candidates):
+        # Add the BM25 contribution of one query word to every candidate that contains it
+        entries = self.postings.get(word)
+        if not entries:
+            return
+        count = len(self.lengths)
+        idf = math.log(1 + (count - len(entries) + 0.5) / (len(entries) + 0.5))
+        average_length = self.total_length / count
+        k1, b, lengths = self.k1, self.b, self.lengths
+        if candidates is not None and len(candidates) < len(entries):
+            pairs = ((q_id, entries[q_id]) for q_id in candidates if q_id in entries)  # Walk the smaller side
+        else:
+            pairs = entries.items() if candidates is None else ((q_id, tf) for q_id, tf in entries.items() if q_id in candidates)
+        for q_id, tf in pairs:
+            norm = tf + k1 * (1 - b + b * lengths[q_id] / average_length)
+            scores[q_id] = scores.get(q_id, 0.0) + idf * tf * (k1 + 1) / norm
+
+class BucketIndex:
+    # Groups question IDs by their (topic, difficulty) pair in plain lists, so a random question can be picked
+    # by position in constant time. Removal swaps the last ID of the bucket into the freed slot.
+
+    def __init__(self):
+        self.buckets = {}  # Maps each (topic, difficulty) pair to a list of question IDs
+        self._slot = {}  # Maps each question ID to its position in its bucket list
+        self._by_topic = {}  # Maps each topic to the set of bucket keys that use it
+        self._by_difficulty = {}  # Maps each difficulty level to the set of bucket keys that use it
+
+    def add(self, question_id, topic, difficulty):
+        # Append a question to the bucket for its topic and difficulty
+        if question_id in self._slot:
+            raise ValueError(f"Question ID {question_id!r} is already in a bucket.")  # It would be sampled from two buckets
+        key = (topic, difficulty)
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            bucket = self.buckets[key] = []
+            self._by_topic.setdefault(topic, set()).add(key)
+            self._by_difficulty.setdefault(difficulty, set()).add(key)
+        self._slot[question_id] = len(bucket)
+        bucket.append(question_id)
+
+    def remove(self, question_id, topic, difficulty):
+        # Remove a question from its bucket by moving the bucket's last ID into its slot
+        key = (topic, difficulty)
+        bucket = self.buckets[key]
+        slot = self._slot.pop(question_id)
+        last_id = bucket.pop()
+        if slot < len(bucket):
+            bucket[slot] = last_id
+            self._slot[last_id] = slot
+        if not bucket:
+            del self.buckets[key]  # Drop empty buckets so they are never considered for sampling
+            self._discard_key(self._by_topic, topic, key)
+            self._discard_key(self._by_difficulty, difficulty, key)
+
+    def add_many(self, topic, difficulty, question_ids):
+        # Append several questions with the same topic and difficulty in one step
+        key = (topic, difficulty)
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            bucket = self.buckets[key] = []
+            self._by_topic.setdefault(topic, set()).add(key)
+            self._by_difficulty.setdefault(difficulty, set()).add(key)
+        self._slot.update(zip(question_ids, range(len(bucket), len(bucket) + len(question_ids))))
+        bucket.extend(question_ids)
+
+    def remove_many(self, topic, difficulty, question_ids):
+        # Remove several questions from one bucket, rebuilding the bucket when most of it goes
+        key = (topic, difficulty)
+        bucket = self.buckets[key]
+        if len(question_ids) * 2 < len(bucket):
+            for question_id in question_ids:
+                self.remove(question_id, topic, difficulty)
+            return
+        removed = set(question_ids)
+        for question_id in removed:
+            del self._slot[question_id]
+        kept = [question_id for question_id in bucket if question_id not in removed]
+        if kept:
+            bucket[:] = kept
+            self._slot.update(zip(kept, range(len(kept))))
+        else:
+            del self.buckets[key]
+            self._discard_key(self._by_topic, topic, key)
+            self._discard_key(self._by_difficulty, difficulty, key)
+
+    @staticmethod
+    def _discard_key(groups, value, key):
+        # Forget a bucket key in one of the topic or difficulty groupings
+        keys = groups[value]
+        keys.discard(key)
+        if not keys:
+            del groups[value]
+
+    def clear(self):
+        # Empty every bucket
+        self.buckets.clear()
+        self._slot.clear()
+        self._by_topic.clear()
+        self._by_difficulty.clear()
+
+    def keys_for(self, topics=None, difficulties=None):
+        # Bucket keys matching optional collections of topics and difficulty levels
+        if topics:
+            keys = set()
+            for topic in topics:
+                keys |= self._by_topic.get(topic, set())
+            if difficulties:
+                difficulties = set(difficulties)
+                keys = {key for key in keys if key[1] in difficulties}
+            return keys
+        if difficulties:
+            keys = set()
+            for difficulty in difficulties:
+                keys |= self._by_difficulty.get(difficulty, set())
+            return keys
+        return set(self.buckets)
+
+    def choice(self, keys):
+        # Pick one question ID uniformly from the given buckets, or None if they are empty
+        # Costs one step per bucket to weigh them by size, then constant time within the bucket.
+        buckets = [self.buckets[key] for key in keys]
+        total = sum(len(bucket) for bucket in buckets)
+        if not total:
+            return None
+        position = random.randrange(total)
+        for bucket in buckets:
+            if position < len(bucket):
+                return bucket[position]
+            position -= len(bucket)
+
+    def sample(self, count, keys, group_of, weights=None, exclude=None):
+        # Draw count distinct question IDs from the given buckets without replacement
+        # A question's chance of being drawn is proportional to weights[group_of(key)] (1 when unlisted).
+        # exclude maps groups to IDs from those buckets that must not be drawn, such as those already picked for a quota.
+        exclude = exclude or {}
+        buckets, cumulative = [], []
+        total = 0.0
+        available = 0
+        for key in keys:
+            weight = 1.0 if weights is None else weights.get(group_of(key), 1.0)
+            if weight <= 0:
+                continue
+            bucket = self.buckets[key]
+            buckets.append(bucket)
+            total += weight * len(bucket)
+            cumulative.append(total)
+            available += len(bucket)
+        excluded = set()
+        for group, question_ids in exclude.items():
+            excluded.update(question_ids)
+            if weights is None or weights.get(group, 1.0) > 0:
+                available -= len(question_ids)  # These IDs sit in buckets counted above
+        if count > available:
+            raise ValueError(f"Only {available} matching questions are available, {count} were requested.")
+        if count == 0:
+            return []
+        if count * 2 > available:
+            return self._sample_exhaustive(count, buckets, cumulative, excluded)
+
+        chosen = excluded
+        drawn = []
+        while len(drawn) < count:
+            # Pick a bucket in proportion to its weight, then a position within it; retry on repeats
+            index = bisect.bisect_right(cumulative, random.random() * total)
+            bucket = buckets[min(index, len(buckets) - 1)]
+            question_id = bucket[random.randrange(len(bucket))]
+            if question_id not in chosen:
+                chosen.add(question_id)
+                drawn.append(question_id)
+        return drawn
+
+    @staticmethod
+    def _sample_exhaustive(count, buckets, cumulative, exclude):
+        # Weighted sampling without replacement over every candidate, used when most of them will be drawn anyway
+        keyed = []
+        previous = 0.0
+        for bucket, running_total in zip(buckets, cumulative):
+            weight = (running_total - previous) / len(bucket)  # Recover the per-question weight of this bucket
+            previous = running_total
+            for question_id in bucket:
+                if question_id not in exclude:
+                    keyed.append((random.random() ** (1 / weight), question_id))  # Efraimidis-Spirakis sampling key
+        return [question_id for _, question_id in heapq.nlargest(count, keyed)]
+
+class QueryCache:
+    # A bounded least-recently-used cache of search_questions results, keyed by the requested topics and difficulty levels.
+    # Each entry is registered under the topics and difficulty levels it depends on, so a change to one question
+    # only drops the entries whose results could include that question.
+    # Both the number of entries and the total number of IDs held across them are bounded, since one broad filter
+    # on a large bank can match a sizable fraction of every question.
+
+    def __init__(self, maxsize=128, max_ids=1_000_000):
+        self.maxsize = maxsize  # Maximum number of cached results; 0 disables caching
+        self.max_ids = max_ids  # Maximum number of question IDs held across all cached results
+        self.cached_ids = 0  # Number of question IDs currently held
+        self._entries = OrderedDict()  # Maps each query key to its frozenset of question IDs, oldest first
+        self._by_topic = {}  # Maps each topic to the keys of entries filtering on it
+        self._by_difficulty = {}  # Maps each difficulty level to the keys of entries filtering on it
+        self._any_topic = set()  # Keys of entries with no topic filter
+        self._any_difficulty = set()  # Keys of entries with no difficulty filter
+        self.hits = 0  # Lookups answered from the cache
+        self.misses = 0  # Lookups that had to be computed
+        self.evictions = 0  # Entries dropped to stay within maxsize and max_ids
+        self.oversized = 0  # Results not cached because they alone hold more than max_ids IDs
+        self.invalidations = 0  # Entries dropped because a question in their buckets changed
+
+    @staticmethod
+    def key(topics, difficulty_range):
+        # Normalize the filters so that the order and repetition of values do not matter
+        return (frozenset(topics) if topics else None, frozenset(difficulty_range) if difficulty_range else None)
+
+    def get(self, key):
+        # Return the cached question IDs for key, or None on a miss
+        result = self._entries.get(key)
+        if result is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)  # Mark the entry as most recently used
+        return result
+
+    def put(self, key, question_ids):
+        # Remember the question IDs for key, evicting the least recently used entry if the cache is full
+        if self.maxsize <= 0:
+            return
+        if len(question_ids) > self.max_ids:
+            self.oversized += 1  # Recomputing a result this large is cheaper than the memory it would pin
+            return
+        if key in self._entries:
+            self._discard(key)
+        self._entries[key] = question_ids
+        self.cached_ids += len(question_ids)
+        topics, difficulties = key
+        self._register(self._by_topic, self._any_topic, topics, key)
+        self._register(self._by_difficulty, self._any_difficulty, difficulties, key)
+        while len(self._entries) > self.maxsize or self.cached_ids > self.max_ids:
+            self._discard(next(iter(self._entries)))
+            self.evictions += 1
+
+    @staticmethod
+    def _register(groups, unfiltered, values, key):
+        # Record that the entry for key depends on each of values (or on every value when there is no filter)
+        if values is None:
+            unfiltered.add(key)
+        else:
+            for value in values:
+                groups.setdefault(value, set()).add(key)
+
+    @staticmethod
+    def _unregister(groups, unfiltered, values, key):
+        # Undo _register for an entry that is leaving the cache
+        if values is None:
+            unfiltered.discard(key)
+        else:
+            for value in values:
+                keys = groups[value]
+                keys.discard(key)
+                if not keys:
+                    del groups[value]
+
+    def _discard(self, key):
+        # Drop one entry and its registrations
+        self.cached_ids -= len(self._entries.pop(key))
+        topics, difficulties = key
+        self._unregister(self._by_topic, self._any_topic, topics, key)
+        self._unregister(self._by_difficulty, self._any_difficulty, difficulties, key)
+
+    def invalidate(self, topic, difficulty):
+        # Drop every entry whose result could include a question with this topic and difficulty
+        if not self._entries:
+            return
+        topic_keys = self._by_topic.get(topic, set()) | self._any_topic
+        if not topic_keys:
+            return
+        affected = topic_keys & (self._by_difficulty.get(difficulty, set()) | self._any_difficulty)
+        for key in affected:
+            self._discard(key)
+        self.invalidations += len(affected)
+
+    def clear(self):
+        # Drop every entry, keeping the counters
+        self.invalidations += len(self._entries)
+        self._entries.clear()
+        self.cached_ids = 0
+        self._by_topic.clear()
+        self._by_difficulty.clear()
+        self._any_topic.clear()
+        self._any_difficulty.clear()
+
+    def info(self):
+        # Counters for tuning the cache size
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "oversized": self.oversized,
+            "cached_ids": self.cached_ids,
+            "max_ids": self.max_ids,
+        }
+
+class DifficultyRange:
+    # An interval of difficulty levels, used in place of a list of exact levels by search_questions,
+    # search_text, random_question, sample_questions, statistics and count_questions.
+    # Levels that parse as numbers compare numerically and come before all other levels, which compare as text.
+    # A bound of None leaves that side open.
+    def __init__(self, low=None, high=None, include_low=True, include_high=True):
+        self.low = low  # Lowest level in the range, or None for no lower bound
+        self.high = high  # Highest level in the range, or None for no upper bound
+        self.include_low = include_low  # Whether a level equal to low is inside the range
+        self.include_high = include_high  # Whether a level equal to high is inside the range
+
+    def __repr__(self):
+        return f"DifficultyRange({self.low!r}, {self.high!r}, include_low={self.include_low}, include_high={self.include_high})"
+
+class DifficultyIndex:
+    # Keeps the known difficulty levels sorted so ranges of levels are found by binary search.
+
+    def __init__(self):
+        self._order = []  # Sort position of each level: (0, number) for numeric levels, (1, text) otherwise
+        self._levels = []  # The levels themselves, in the same order
+
+    @staticmethod
+    def sort_key(level):
+        # Position of a level (or a range bound) in the difficulty ordering
+        try:
+            number = float(level)
+        except (TypeError, ValueError):
+            return (1, str(level))
+        if math.isnan(number):
+            return (1, str(level))  # "nan" is not a usable number, so it sorts as text
+        return (0, number)
+
+    def add(self, level):
+        # Insert a level the first time it is seen
+        key = self.sort_key(level)
+        index = bisect.bisect_left(self._order, key)
+        end = bisect.bisect_right(self._order, key, index)
+        if level in self._levels[index:end]:
+            return  # Already known; equal keys are rare ("3" and "3.0"), so this slice is tiny
+        self._order.insert(end, key)
+        self._levels.insert(end, level)
+
+    def clear(self):
+        # Forget every level
+        self._order.clear()
+        self._levels.clear()
+
+    def levels(self, difficulty_range=None, reverse=False):
+        # Known levels inside difficulty_range (all levels when it is None), in ascending order unless reverse
+        start, end = 0, len(self._levels)
+        if difficulty_range is not None:
+            if difficulty_range.low is not None:
+                key = self.sort_key(difficulty_range.low)
+                find = bisect.bisect_left if difficulty_range.include_low else bisect.bisect_right
+                start = find(self._order, key)
+            if difficulty_range.high is not None:
+                key = self.sort_key(difficulty_range.high)
+                find = bisect.bisect_right if difficulty_range.include_high else bisect.bisect_left
+                end = find(self._order, key)
+        selected = self._levels[start:max(start, end)]
+        return selected[::-1] if reverse else selected
+
+class BinarySnapshot:
+    # A versioned binary file holding the question table and the (topic, difficulty) buckets, as an alternative
+    # to CSV. Every column is stored as a raw typed array, so opening one is a handful of memory copies instead of
+    # parsing every row, and the question text is only read from the memory-mapped file when a question is accessed.
+    #
+    # Layout (little-endian): a header (magic, version, row count, next ID), a table with the offset and length
+    # of every section, then the sections themselves, each aligned to 8 bytes.
+    MAGIC = b"QBNK"
+    VERSION = 1
+    EXTENSION = ".qbk"  # save_to_file writes this format for file names ending in it
+    HEADER = struct.Struct("<4sIqq")  # Magic, version, row count, next ID
+    SECTION = struct.Struct("<QQ")  # Offset and length of one section
+    SECTIONS = ("ids", "text_start", "text_length", "topic_codes", "difficulty_codes",
+                "topic_names", "difficulty_names", "buckets", "bucket_ids", "text")
+
+    def __init__(self, filename):
+        # Map a snapshot file into memory and read its header and section table
+        self.filename = filename
+        with open(filename, 'rb') as file:
+            self.mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)  # The mapping stays valid after the file is closed
+        magic, version, self.row_count, self.next_id = self.HEADER.unpack_from(self.mapping, 0)
+        if magic != self.MAGIC:
+            raise ValueError(f"{filename} is not a question bank snapshot.")
+        if version != self.VERSION:
+            raise ValueError(f"{filename} uses snapshot version {version}, but only version {self.VERSION} is supported.")
+        self.sections = {}  # Maps each section name to its (offset, length)
+        for index, name in enumerate(self.SECTIONS):
+            self.sections[name] = self.SECTION.unpack_from(self.mapping, self.HEADER.size + index * self.SECTION.size)
+
+    @classmethod
+    def is_binary(cls, filename):
+        # True if the file starts like a binary snapshot
+        with open(filename, 'rb') as file:
+            return file.read(len(cls.MAGIC)) == cls.MAGIC
+
+    def array(self, name, typecode):
+        # Copy one numeric section into a typed array
+        offset, length = self.sections[name]
+        values = array(typecode)
+        values.frombytes(self.mapping[offset:offset + length])
+        if sys.byteorder != "little":
+            values.byteswap()
+        return values
+
+    def names(self, name):
+        # Read one of the interned topic or difficulty name tables
+        offset, length = self.sections[name]
+        return json.loads(self.mapping[offset:offset + length])
+
+    @classmethod
+    def write(cls, file, bank):
+        # Write the questions and buckets of a bank to an open binary file
+        ids = array('q')
+        text = bytearray()
+        text_start, text_length = array('Q'), array('I')
+        topic_codes, difficulty_codes = array('I'), array('I')
+        topic_names, topic_lookup = [], {}
+        difficulty_names, difficulty_lookup = [], {}
+        intern = ColumnarQuestionStore._intern
+        try:
+            for q_id, question in bank.questions.items():
+                ids.append(q_id)
+                text_start.append(len(text))
+                if question['question'] is None:
+                    text_length.append(ColumnarQuestionStore.NO_TEXT)
+                else:
+                    encoded = question['question'].encode('utf-8')
+                    text_length.append(len(encoded))
+                    text += encoded
+                topic_codes.append(intern(topic_names, topic_lookup, question['topic']))
+                difficulty_codes.append(intern(difficulty_names, difficulty_lookup, question['difficulty']))
+        except (TypeError, OverflowError):
+            raise ValueError("Binary snapshots need integer question IDs.")
+
+        buckets, bucket_ids = array('Q'), array('q')
+        for (topic, difficulty), question_ids in bank.buckets.buckets.items():
+            buckets.extend((topic_lookup[topic], difficulty_lookup[difficulty], len(bucket_ids), len(question_ids)))
+            bucket_ids.extend(question_ids)
+
+        sections = [ids, text_start, text_length, topic_codes, difficulty_codes,
+                    json.dumps(topic_names).encode('utf-8'), json.dumps(difficulty_names).encode('utf-8'),
+                    buckets, bucket_ids, text]
+        if sys.byteorder != "little":
+            for section in sections:
+                if isinstance(section, array):
+                    section.byteswap()
+        position = cls.HEADER.size + len(sections) * cls.SECTION.size
+        table = []
+        for section in sections:
+            position += -position % 8  # Align every section to 8 bytes
+            length = len(section) * section.itemsize if isinstance(section, array) else len(section)
+            table.append((position, length))
+            position += length
+
+        file.write(cls.HEADER.pack(cls.MAGIC, cls.VERSION, len(ids), bank.next_id))
+        for offset, length in table:
+            file.write(cls.SECTION.pack(offset, length))
+        for section, (offset, length) in zip(sections, table):
+            file.write(b"\0" * (offset - file.tell()))  # Padding up to the aligned offset
+            file.write(section)
+
+class DuplicateIndex:
+    # Near-duplicate detection with MinHash signatures and locality-sensitive hashing (LSH).
+    # A question's text is cut into overlapping character shingles, and each shingle is hashed once. The hashes are
+    # spread over a fixed number of slots and each slot keeps its smallest hash (one-permutation MinHash); empty slots
+    # borrow from the next filled slot to their right. The fraction of slots where two signatures agree estimates the
+    # Jaccard similarity of the shingle sets. Signatures are split into bands, and only questions that share a whole
+    # band are compared, so a lookup touches a fixed number of buckets rather than every question.
+    SHINGLE_SIZE = 5  # Characters per shingle; short enough to survive rewording, long enough to ignore shared letters
+    PRIME = (1 << 61) - 1  # Modulus of the shingle hash (a Mersenne prime)
+    EMPTY = (1 << 64) - 1  # Marker for a slot no shingle hashed into
+    PARALLEL_MIN_ROWS = 5000  # Fewer rows than this are hashed in this process; starting a pool would cost more
+
+    def __init__(self, slots=96, bands=16, seed=1):
+        # With 96 slots in 16 bands of 6, pairs 80% similar share a band with probability above 0.99,
+        # while only about 1% of pairs 30% similar are even compared
+        if bands <= 0 or slots % bands:
+            raise ValueError("slots must be a positive multiple of bands.")
+        rng = random.Random(seed)
+        self.parameters = (slots, rng.randrange(1, self.PRIME), rng.randrange(self.PRIME))  # Slot count and hash constants
+        self.bands = [{} for _ in range(bands)]  # Per band, maps the hash of the band's slots to the ID or IDs that have it
+
+    @classmethod
+    def shingles(cls, text):
+        # Hashes of the character shingles of text, after lowercasing and collapsing punctuation and spaces
+        normalized = " ".join(TextIndex.tokenize(text))
+        if len(normalized) <= cls.SHINGLE_SIZE:
+            return {zlib.crc32(normalized.encode())}  # Very short questions are a single shingle
+        return {zlib.crc32(normalized[start:start + cls.SHINGLE_SIZE].encode())
+                for start in range(len(normalized) - cls.SHINGLE_SIZE + 1)}
+
+    @classmethod
+    def signature(cls, text, parameters):
+        # MinHash signature of text; parameters is the (slots, multiplier, offset) of the index
+        slots, multiplier, offset = parameters
+        prime, empty = cls.PRIME, cls.EMPTY
+        minimums = [empty] * slots
+        for value in cls.shingles(text):
+            mixed = (value * multiplier + offset) % prime
+            slot, rank = mixed % slots, mixed // slots
+            if rank < minimums[slot]:
+                minimums[slot] = rank
+        if empty in minimums:
+            # Fill each empty slot from the next filled slot to its right, wrapping around, and mark how far it
+            # reached so that two questions only agree on a borrowed slot when they borrowed the same value
+            distance_step = prime // slots + 1  # Larger than any rank
+            source = next(index for index, rank in enumerate(minimums) if rank != empty) + slots
+            for index in range(slots - 1, -1, -1):
+                if minimums[index] == empty:
+                    minimums[index] = minimums[source % slots] + (source - index) * distance_step
+                else:
+                    source = index
+        return array('Q', minimums)
+
+    @classmethod
+    def signature_chunk(cls, rows, parameters):
+        # Runs in a worker process: signatures for a chunk of (question_id, text) rows
+        return [(question_id, cls.signature(text, parameters)) for question_id, text in rows]
+
+    def compute_signatures(self, rows, processes=None):
+        # Yield (question_id, signature) for (question_id, text) rows, spreading large inputs over a process pool
+        # processes is the number of worker processes (None uses one per CPU, 1 stays in this process)
+        rows = list(rows)
+        if processes == 1 or len(rows) < self.PARALLEL_MIN_ROWS:
+            yield from self.signature_chunk(rows, self.parameters)
+            return
+        workers = processes or os.cpu_count() or 1
+        chunk_size = max(1000, -(-len(rows) // (workers * 4)))  # A few chunks per worker keeps them all busy to the end
+        chunks = [rows[start:start + chunk_size] for start in range(0, len(rows), chunk_size)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for signatures in pool.map(self.signature_chunk, chunks, repeat(self.parameters)):
+                yield from signatures
+
+    def _band_keys(self, signature):
+        # One integer hash per band of a signature. A band takes every len(bands)-th slot rather than neighbouring
+        # ones, because an empty slot copies its neighbour and neighbouring slots would often hold one shingle's hash.
+        band_count = len(self.bands)
+        return [hash(signature[band::band_count].tobytes()) for band in range(band_count)]
+
+    @staticmethod
+    def similarity(first, second):
+        # Estimated Jaccard similarity of two signatures: the fraction of positions where they agree
+        return sum(map(operator.eq, first, second)) / len(first)
+
+    def insert(self, question_id, signature):
+        # Add a question whose signature is already known; inserting the same signature twice changes nothing
+        # Only the band hashes are kept, so a bucket holds a lone ID or, once two questions share it, a list of IDs.
+        for band, key in zip(self.bands, self._band_keys(signature)):
+            bucket = band.get(key)
+            if bucket is None:
+                band[key] = question_id
+            elif isinstance(bucket, list):
+                if question_id not in bucket:
+                    bucket.append(question_id)
+            elif bucket != question_id:
+                band[key] = [bucket, question_id]
+
+    def add(self, question_id, text, threshold, text_of):
+        # Add a question and return the questions already indexed that are at least threshold similar to it
+        # text_of(question_id) returns the text of an indexed question, whose signature is recomputed to score it
+        signature = self.signature(text, self.parameters)
+        matches = self.matches(signature, threshold, text_of)
+        self.insert(question_id, signature)
+        return matches
+
+    def remove(self, question_id, text):
+        # Forget a question; text must be the text it was indexed with
+        for band, key in zip(self.bands, self._band_keys(self.signature(text, self.parameters))):
+            bucket = band.get(key)
+            if bucket == question_id:
+                del band[key]
+            elif isinstance(bucket, list) and question_id in bucket:
+                bucket.remove(question_id)
+                if len(bucket) == 1:
+                    band[key] = bucket[0]  # Back to a lone ID
+
+    def _bucket_ids(self, bucket):
+        # The IDs in one bucket as a list
+        return bucket if isinstance(bucket, list) else [bucket]
+
+    def matches(self, signature, threshold, text_of):
+        # (question_id, similarity) of indexed questions at least threshold similar to signature, most similar first
+        candidates = set()
+        for band, key in zip(self.bands, self._band_keys(signature)):
+            bucket = band.get(key)
+            if bucket is not None:
+                candidates.update(self._bucket_ids(bucket))
+        scored = [(question_id, self.similarity(signature, self.signature(text_of(question_id), self.parameters)))
+                  for question_id in candidates]
+        return sorted((match for match in scored if match[1] >= threshold), key=lambda match: -match[1])
+
+    def clusters(self, threshold, text_of, processes=None):
+        # Group indexed questions into clusters of near-duplicates
+        # Returns one {"ids": [...], "pairs": [(first_id, second_id, similarity), ...]} per cluster, largest first;
+        # pairs lists every compared pair at least threshold similar, and clusters join pairs that share a question.
+        # Signatures are recomputed, across a process pool when there are many, only for questions sharing a bucket.
+        shared = [bucket for band in self.bands for bucket in band.values() if isinstance(bucket, list)]
+        candidate_ids = set(chain.from_iterable(shared))
+        signatures = dict(self.compute_signatures(((q_id, text_of(q_id)) for q_id in candidate_ids), processes))
+        parent = {}
+
+        def find(question_id):
+            # Root of a question's cluster, halving the path on the way
+            while parent[question_id] != question_id:
+                parent[question_id] = parent[parent[question_id]]
+                question_id = parent[question_id]
+            return question_id
+
+        compared = set()
+        pairs = []
+        for bucket in shared:
+            for index, first in enumerate(bucket):
+                for second in bucket[index + 1:]:
+                    if (first, second) in compared or (second, first) in compared:
+                        continue  # Already compared through another band
+                    compared.add((first, second))
+                    score = self.similarity(signatures[first], signatures[second])
+                    if score < threshold:
+                        continue
+                    pairs.append((first, second, score))
+                    parent.setdefault(first, first)
+                    parent.setdefault(second, second)
+                    root_first, root_second = find(first), find(second)
+                    if root_first != root_second:
+                        parent[root_second] = root_first
+
+        clusters = {}
+        for first, second, score in pairs:
+            cluster = clusters.setdefault(find(first), {"ids": set(), "pairs": []})
+            cluster["ids"].update((first, second))
+            cluster["pairs"].append((first, second, score))
+        result = []
+        for cluster in clusters.values():
+            cluster["ids"] = sorted(cluster["ids"])
+            cluster["pairs"].sort(key=lambda pair: -pair[2])
+            result.append(cluster)
+        result.sort(key=lambda cluster: (-len(cluster["ids"]), cluster["ids"][0]))
+        return result
+
+    def clear(self):
+        # Forget every question
+        for band in self.bands:
+            band.clear()
+
+class Instrumentation:
+    # Call counts and latency histograms per method. Latencies are counted in power-of-two nanosecond buckets,
+    # so recording a call costs a few integer operations and the histogram has a fixed size.
+    BUCKET_COUNT = 64  # Bucket i holds calls that took fewer than 2**i nanoseconds
+
+    def __init__(self):
+        self.calls = {}  # Maps each method name to its number of calls
+        self.total_ns = {}  # Maps each method name to the total time spent in it
+        self.histograms = {}  # Maps each method name to its list of bucket counts
+
+    def record(self, name, elapsed_ns):
+        # Count one call of name that took elapsed_ns nanoseconds
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = [0] * self.BUCKET_COUNT
+            self.calls[name] = 0
+            self.total_ns[name] = 0
+        histogram[min(elapsed_ns.bit_length(), self.BUCKET_COUNT - 1)] += 1
+        self.calls[name] += 1
+        self.total_ns[name] += elapsed_ns
+
+    def wrap(self, name, method):
+        # Return a version of method that records its latency under name
+        @functools.wraps(method)
+        def timed(*args, **kwargs):
+            started = time.perf_counter_ns()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self.record(name, time.perf_counter_ns() - started)
+        return timed
+
+    def percentile(self, name, fraction):
+        # Upper bound, in nanoseconds, of the bucket holding the given fraction of calls (0.5 for the median)
+        histogram = self.histograms[name]
+        target = fraction * self.calls[name]
+        seen = 0
+        for index, count in enumerate(histogram):
+            seen += count
+            if count and seen >= target:
+                return 2 ** index
+        return 2 ** (self.BUCKET_COUNT - 1)
+
+    def report(self):
+        # Summary per method: calls, total and mean time, approximate median and 99th percentile, and the histogram
+        summary = {}
+        for name, histogram in self.histograms.items():
+            calls = self.calls[name]
+            summary[name] = {
+                "calls": calls,
+                "total_ms": self.total_ns[name] / 1e6,
+                "mean_us": self.total_ns[name] / calls / 1e3,
+                "p50_us": self.percentile(name, 0.5) / 1e3,
+                "p99_us": self.percentile(name, 0.99) / 1e3,
+                "histogram_ns": {f"<{2 ** index}": count for index, count in enumerate(histogram) if count},
+            }
+        return summary
+
+    def reset(self):
+        # Forget everything recorded so far
+        self.calls.clear()
+        self.total_ns.clear()
+        self.histograms.clear()
+
+class QuestionBank:
+    LOAD_BATCH_ROWS = 50000  # Rows added per batch while loading a file
+    INSTRUMENTED_METHODS = ("add_question", "update_question", "delete_question", "add_many", "update_many", "delete_many",
+                            "search_questions", "search_text", "random_question", "sample_questions", "count_questions",
+                            "statistics", "save_to_file", "load_from_file", "similar_questions",
+                            "find_near_duplicates")  # Methods timed by enable_instrumentation
+
+    def __init__(self, storage="dict", journal=None, text_index=False, cache_size=128, duplicate_index=False,
+                 duplicate_threshold=0.8, cache_ids=1_000_000):
+        # Initialize the QuestionBank object with empty data structures
+        # storage="dict" keeps one dictionary per question; storage="columnar" uses the compact ColumnarQuestionStore
+        # journal is an optional ChangeJournal; with one, mutations are appended to a log and saves only write the changes
+        # text_index=True keeps an inverted index of the question text for search_text; it is off by default because
+        # its postings take more memory per question than the rest of a columnar bank
+        # cache_size bounds the number of search_questions results kept in the query cache (0 disables it),
+        # and cache_ids the total number of question IDs those results may hold
+        # duplicate_index=True keeps a DuplicateIndex so add_question reports likely duplicates as they are added;
+        # duplicate_threshold is the estimated similarity from which two questions count as near-duplicates
+        if storage == "dict":
+            self.questions = {}  # A dictionary to store questions by their unique IDs
+        elif storage == "columnar":
+            self.questions = ColumnarQuestionStore()  # A dictionary-like columnar store for very large banks
+        else:
+            raise ValueError(f"Unknown storage backend: {storage}")
+        self.storage = storage  # Remember which backend is in use
+        self.topics = {}  # A dictionary to keep track of which question IDs are associated with each topic
+        self.difficulty_levels = {}  # A dictionary to keep track of which question IDs are associated with each difficulty level
+        self.journal = journal  # Optional ChangeJournal that makes saves incremental
+        self.text_index = TextIndex() if text_index else None  # Inverted index of question words
+        self.text_pending = set()  # IDs added in bulk whose words are indexed on the next search_text
+        self.buckets = BucketIndex()  # Question IDs grouped by (topic, difficulty) for constant-time random picks
+        self.difficulty_order = DifficultyIndex()  # Difficulty levels in sorted order for range queries
+        self.query_cache = QueryCache(cache_size, cache_ids)  # Recent search_questions results
+        self.next_id = 1  # Next ID handed out by allocate_id; always above every ID ever stored
+        self.instrumentation = None  # Instrumentation recording method latencies, when enabled
+        self.duplicate_index = DuplicateIndex() if duplicate_index else None  # MinHash signatures for duplicate checks
+        self.duplicate_pending = set()  # IDs added in bulk whose signatures are computed on the next duplicate check
+        self.duplicate_threshold = duplicate_threshold
+
+    def add_question(self, question_id, question, topic, difficulty):
+        # Add a new question to the question bank; an existing question with the same ID is replaced
+        # With the duplicate index enabled, returns (question_id, similarity) for existing questions that are likely
+        # duplicates of the new one, most similar first; otherwise returns an empty list
+        self.flush_duplicate_index()  # The new question is compared with everything, including rows added in bulk
+        if question_id in self.questions:
+            self._remove(question_id)  # Take the old version out of every index first, as loading a file does
+        duplicates = self._insert(question_id, question, topic, difficulty)
+        self._log_put(question_id)  # Record the change in the journal when journaling is enabled
+        return duplicates
+
+    def enable_instrumentation(self):
+        # Start recording call counts and latencies of the public methods; returns the Instrumentation object
+        # The timing wrappers are installed on this instance only, so a bank without instrumentation pays nothing.
+        if self.instrumentation is None:
+            self.instrumentation = Instrumentation()
+            for name in self.INSTRUMENTED_METHODS:
+                setattr(self, name, self.instrumentation.wrap(name, getattr(self, name)))
+        return self.instrumentation
+
+    def disable_instrumentation(self):
+        # Remove the timing wrappers; returns the Instrumentation object with everything recorded so far
+        instrumentation = self.instrumentation
+        if instrumentation is not None:
+            for name in self.INSTRUMENTED_METHODS:
+                del self.__dict__[name]  # Uncover the plain class method again
+            self.instrumentation = None
+        return instrumentation
+
+    def allocate_id(self):
+        # Hand out a question ID that has never been used in this bank, even by deleted questions
+        question_id = self.next_id
+        self.next_id += 1
+        return question_id
+
+    def _note_id(self, question_id):
+        # Keep the ID allocator above an ID that was chosen by the caller
+        if isinstance(question_id, int) and question_id >= self.next_id:
+            self.next_id = question_id + 1
+
+    def _insert(self, question_id, question, topic, difficulty):
+        # Store a new question and index it, without touching the journal
+        self.questions[question_id] = {'question': question, 'topic': topic, 'difficulty': difficulty}
+        self._note_id(question_id)
+
+        # Update the topics dictionary to include the new question ID
+        if topic not in self.topics:
+            self.topics[topic] = set()  # Create a new set for this topic if it does not exist
+        self.topics[topic].add(question_id)  # Add the question ID to the set for this topic
+
+        # Update the difficulty_levels dictionary to include the new question ID
+        if difficulty not in self.difficulty_levels:
+            self.difficulty_levels[difficulty] = set()  # Create a new set for this difficulty level if it does not exist
+            self.difficulty_order.add(difficulty)  # Give the new level its place in the difficulty ordering
+        self.difficulty_levels[difficulty].add(question_id)  # Add the question ID to the set for this difficulty level
+
+        self.buckets.add(question_id, topic, difficulty)  # Add the question to its (topic, difficulty) bucket
+        self.query_cache.invalidate(topic, difficulty)  # Cached searches covering this bucket are now stale
+        self._index_text(question_id, question)  # Index the words of the new question
+        return self._index_duplicates(question_id, question)  # Fingerprint the new question for duplicate checks
+
+    def _index_text(self, question_id, question):
+        # Add a question's words to the text index
+        if self.text_index is not None:
+            self.text_index.add(question_id, question)
+
+    def _unindex_text(self, question_id, question):
+        # Remove a question's words from the text index, or just forget it if it was never indexed
+        if self.text_index is None:
+            return
+        if question_id in self.text_pending:
+            self.text_pending.discard(question_id)
+        else:
+            self.text_index.remove(question_id, question)
+
+    def _flush_text_index(self):
+        # Index the words of questions that were added in bulk
+        # This is O(N) in the rows added since the last search, so the first search_text after a load pays for them all
+        if self.text_pending:
+            self.text_index.add_many((q_id, self.questions[q_id]['question']) for q_id in self.text_pending)
+            self.text_pending.clear()
+
+    def _index_duplicates(self, question_id, question):
+        # Add a question's signature to the duplicate index; returns the likely duplicates found on the way
+        if self.duplicate_index is None:
+            return []
+        if self.duplicate_pending:
+            self.duplicate_pending.add(question_id)  # Keep waiting for the bulk flush rather than hashing row by row
+            return []
+        return self.duplicate_index.add(question_id, question, self.duplicate_threshold, self._question_text)
+
+    def _question_text(self, question_id):
+        # Text of a stored question, for the duplicate index to recompute its signature
+        return self.questions[question_id]['question']
+
+    def _unindex_duplicates(self, question_id, question):
+        # Remove a question from the duplicate index, or just forget it if its signature was never computed
+        # question must be the text it was indexed with
+        if self.duplicate_index is None:
+            return
+        if question_id in self.duplicate_pending:
+            self.duplicate_pending.discard(question_id)
+        else:
+            self.duplicate_index.remove(question_id, question)
+
+    def flush_duplicate_index(self, processes=None):
+        # Compute the signatures of questions that were added in bulk, in parallel when there are many
+        # Otherwise the next duplicate check does this work; the GUI calls it on its loading thread instead
+        if not self.duplicate_pending:
+            return
+        rows = [(q_id, self.questions[q_id]['question']) for q_id in self.duplicate_pending]
+        for question_id, signature in self.duplicate_index.compute_signatures(rows, processes):
+            self.duplicate_index.insert(question_id, signature)
+        self.duplicate_pending.clear()
+
+    def similar_questions(self, question, threshold=None):
+        # (question_id, similarity) of stored questions that are likely duplicates of the given text, most similar first
+        # Uses the duplicate index when it is enabled, and otherwise compares against every question
+        threshold = self.duplicate_threshold if threshold is None else threshold
+        if self.duplicate_index is not None:
+            self.flush_duplicate_index()
+            index = self.duplicate_index
+            return index.matches(index.signature(question, index.parameters), threshold, self._question_text)
+        index = DuplicateIndex()
+        signature = index.signature(question, index.parameters)
+        rows = ((q_id, details['question']) for q_id, details in self.questions.items())
+        scored = ((q_id, index.similarity(signature, other)) for q_id, other in index.compute_signatures(rows))
+        return sorted((match for match in scored if match[1] >= threshold), key=lambda match: -match[1])
+
+    def find_near_duplicates(self, threshold=None, processes=None):
+        # Group the questions into clusters of near-duplicates; see DuplicateIndex.clusters for the result format
+        # Signatures are computed across a pool of processes (processes=None uses one per CPU, 1 stays in this process)
+        threshold = self.duplicate_threshold if threshold is None else threshold
+        if self.duplicate_index is not None:
+            self.flush_duplicate_index(processes)
+            return self.duplicate_index.clusters(threshold, self._question_text, processes)
+        index = DuplicateIndex()  # Without the incremental index, build a throwaway one for this run
+        rows = [(q_id, details['question']) for q_id, details in self.questions.items()]
+        for question_id, signature in index.compute_signatures(rows, processes):
+            index.insert(question_id, signature)
+        return index.clusters(threshold, self._question_text, processes)
+
+    def update_question(self, question_id, question=None, topic=None, difficulty=None):
+        # Update an existing question's details
+        if question_id in self.questions:
+            self._update(question_id, question, topic, difficulty)
+            self._log_put(question_id)  # Record the new version of the question in the journal
+        else:
+            print("Question not found.")  # Print a message if the question ID does not exist
+
+    def _update(self, question_id, question, topic, difficulty):
+        # Apply new details to an existing question and move it between index sets, without touching the journal
+        details = self.questions[question_id]  # Fetch the current details (a fresh copy with the columnar store)
+        old_key = (details['topic'], details['difficulty'])
+        if question:
+            self._unindex_text(question_id, details['question'])  # Re-index the question under its new words
+            self._index_text(question_id, question)
+            self._unindex_duplicates(question_id, details['question'])  # Fingerprint the new text
+            self._index_duplicates(question_id, question)
+            details['question'] = question  # Update the question text if a new one is provided
+        if topic:
+            old_topic = details['topic']
+            # Remove the question from the old topic and add it to the new topic
+            self.topics[old_topic].remove(question_id)
+            if topic not in self.topics:
+                self.topics[topic] = set()  # Create a new set for the new topic if it does not exist
+            self.topics[topic].add(question_id)  # Add the question ID to the set for the new topic
+            details['topic'] = topic  # Update the topic for the question
+        if difficulty:
+            old_difficulty = details['difficulty']
+            # Remove the question from the old difficulty level and add it to the new difficulty level
+            self.difficulty_levels[old_difficulty].remove(question_id)
+            if difficulty not in self.difficulty_levels:
+                self.difficulty_levels[difficulty] = set()  # Create a new set for the new difficulty level if it does not exist
+                self.difficulty_order.add(difficulty)  # Give the new level its place in the difficulty ordering
+            self.difficulty_levels[difficulty].add(question_id)  # Add the question ID to the set for the new difficulty level
+            details['difficulty'] = difficulty  # Update the difficulty for the question
+        if (details['topic'], details['difficulty']) != old_key:
+            self.buckets.remove(question_id, *old_key)  # Move the question to the bucket for its new topic and difficulty
+            self.buckets.add(question_id, details['topic'], details['difficulty'])
+            self.query_cache.invalidate(*old_key)  # Searches over either bucket are now stale
+            self.query_cache.invalidate(details['topic'], details['difficulty'])
+        self.questions[question_id] = details  # Write the updated details back to the store
+
+    def add_many(self, rows):
+        # Add many questions at once; rows are (question_id, question, topic, difficulty) tuples
+        # A question_id of None asks for a new ID from allocate_id. Every row is checked before anything changes,
+        # so either all rows are added or a ValueError is raised and the bank is left as it was.
+        # Returns the IDs of the added questions, in order.
+        rows = list(rows)
+        for row in rows:
+            if len(row) != 4:
+                raise ValueError(f"Expected (question_id, question, topic, difficulty), got {row!r}")
+        explicit_ids = [row[0] for row in rows if row[0] is not None]
+        seen = set(explicit_ids)
+        if len(seen) != len(explicit_ids):
+            repeated = next(question_id for question_id, count in Counter(explicit_ids).items() if count > 1)
+            raise ValueError(f"Question ID {repeated!r} appears more than once.")
+        in_use = next(filter(self.questions.__contains__, seen), None)
+        if in_use is not None:
+            raise ValueError(f"Question ID {in_use!r} is already in use.")
+        int_ids = [question_id for question_id in seen if isinstance(question_id, int)]
+        if int_ids:
+            self._note_id(max(int_ids))  # Allocated IDs must not collide with explicit IDs in the same batch
+        if len(explicit_ids) < len(rows):
+            rows = [(self.allocate_id(),) + tuple(row[1:]) if row[0] is None else row for row in rows]
+        self._insert_many(rows)
+        if self.journal is not None:
+            self.journal.record_batch([ChangeJournal.put_record(row[0], self.questions[row[0]]) for row in rows])
+        return [row[0] for row in rows]
+
+    def _insert_many(self, rows):
+        # Store and index new questions with distinct, unused IDs, updating each index bucket once
+        # The caller is responsible for keeping next_id above the new IDs.
+        # Their words are indexed in one pass on the next search_text instead of row by row here.
+        groups = {}  # Maps each (topic, difficulty) pair to the new question IDs in it
+        questions = self.questions
+        for question_id, question, topic, difficulty in rows:
+            questions[question_id] = {'question': question, 'topic': topic, 'difficulty': difficulty}
+            key = (topic, difficulty)
+            group = groups.get(key)
+            if group is None:
+                groups[key] = [question_id]
+            else:
+                group.append(question_id)
+        self._index_groups(groups)
+        if self.text_index is not None:
+            self.text_pending.update(row[0] for row in rows)
+        if self.duplicate_index is not None:
+            self.duplicate_pending.update(row[0] for row in rows)  # Signatures are computed together on the next check
+
+    def _index_groups(self, groups):
+        # Add groups of question IDs to the topic, difficulty and bucket indexes, one update per group
+        for (topic, difficulty), question_ids in groups.items():
+            if topic not in self.topics:
+                self.topics[topic] = set()
+            self.topics[topic].update(question_ids)
+            if difficulty not in self.difficulty_levels:
+                self.difficulty_levels[difficulty] = set()
+                self.difficulty_order.add(difficulty)
+            self.difficulty_levels[difficulty].update(question_ids)
+            self.buckets.add_many(topic, difficulty, question_ids)
+            self.query_cache.invalidate(topic, difficulty)
+
+    def _unindex_groups(self, groups):
+        # Remove groups of question IDs from the topic, difficulty and bucket indexes, one update per group
+        for (topic, difficulty), question_ids in groups.items():
+            self.topics[topic].difference_update(question_ids)
+            self.difficulty_levels[difficulty].difference_update(question_ids)
+            self.buckets.remove_many(topic, difficulty, question_ids)
+            self.query_cache.invalidate(topic, difficulty)
+
+    def update_many(self, updates):
+        # Update many questions at once; updates are (question_id, question, topic, difficulty) tuples
+        # As with update_question, a missing (None or empty) field keeps its current value. Every update is
+        # checked first, so either all are applied or a ValueError is raised and the bank is left as it was.
+        updates = [tuple(update) for update in updates]
+        seen = set()
+        for update in updates:
+            if len(update) != 4:
+                raise ValueError(f"Expected (question_id, question, topic, difficulty), got {update!r}")
+            if update[0] not in self.questions:
+                raise ValueError(f"Question ID {update[0]!r} not found.")
+            if update[0] in seen:
+                raise ValueError(f"Question ID {update[0]!r} is updated more than once.")
+            seen.add(update[0])
+
+        removed, added = {}, {}  # Questions leaving and joining each (topic, difficulty) bucket
+        for question_id, question, topic, difficulty in updates:
+            details = self.questions[question_id]
+            old_key = (details['topic'], details['difficulty'])
+            if question:
+                self._unindex_text(question_id, details['question'])  # Re-index the question under its new words
+                self._index_text(question_id, question)
+                self._unindex_duplicates(question_id, details['question'])
+                if self.duplicate_index is not None:
+                    self.duplicate_pending.add(question_id)  # Fingerprinted with the other pending rows
+                details['question'] = question
+            if topic:
+                details['topic'] = topic
+            if difficulty:
+                details['difficulty'] = difficulty
+            new_key = (details['topic'], details['difficulty'])
+            if new_key != old_key:
+                removed.setdefault(old_key, []).append(question_id)
+                added.setdefault(new_key, []).append(question_id)
+            self.questions[question_id] = details
+        self._unindex_groups(removed)
+        self._index_groups(added)
+        if self.journal is not None:
+            self.journal.record_batch([ChangeJournal.put_record(update[0], self.questions[update[0]]) for update in updates])
+
+    def delete_many(self, question_ids):
+        # Delete many questions at once. Every ID is checked first, so either all are deleted or a ValueError
+        # is raised and the bank is left as it was.
+        question_ids = list(question_ids)
+        seen = set()
+        for question_id in question_ids:
+            if question_id not in self.questions:
+                raise ValueError(f"Question ID {question_id!r} not found.")
+            if question_id in seen:
+                raise ValueError(f"Question ID {question_id!r} is deleted more than once.")
+            seen.add(question_id)
+
+        groups = {}  # Maps each (topic, difficulty) pair to the deleted question IDs in it
+        for question_id in question_ids:
+            details = self.questions.pop(question_id)
+            groups.setdefault((details['topic'], details['difficulty']), []).append(question_id)
+            self._unindex_text(question_id, details['question'])
+            self._unindex_duplicates(question_id, details['question'])
+        self._unindex_groups(groups)
+        if self.journal is not None:
+            self.journal.record_batch([{'op': 'delete', 'id': question_id} for question_id in question_ids])
+
+    def search_questions(self, topics=None, difficulty_range=None):
+        # Search for questions based on provided topics and difficulty levels
+        # difficulty_range is either a list of exact levels or a DifficultyRange
+        result_ids = self._filter_ids(topics, difficulty_range)  # Matching question IDs, or None when nothing is filtered
+        if result_ids is None:
+            return list(self.questions.values())  # No filters: every question matches
+        return [self.questions[q_id] for q_id in result_ids]  # Return the details of the matching questions
+
+    def cache_info(self):
+        # Hit, miss, eviction and invalidation counters of the search_questions cache
+        return self.query_cache.info()
+
+    def search_text(self, query, k=10, topics=None, difficulty_range=None):
+        # Rank questions by how well their text matches query, optionally limited by topics and difficulty levels
+        # Words in double quotes must appear together as a phrase. Returns up to k (question ID, score) pairs, best first.
+        if self.text_index is None:
+            raise ValueError("The text index is disabled for this question bank.")
+        self._flush_text_index()
+        allowed_ids = self._filter_ids(topics, difficulty_range)
+        return self.text_index.search(query, lambda q_id: self.questions[q_id]['question'], k, allowed_ids)
+
+    def _difficulty_filter(self, difficulty_range):
+        # Turn a difficulty filter into a list of exact levels, or None when it does not filter anything
+        # A DifficultyRange becomes the known levels inside it, found by binary search over the sorted levels.
+        if isinstance(difficulty_range, DifficultyRange):
+            return self.difficulty_order.levels(difficulty_range)
+        return difficulty_range or None
+
+    def _bucket_keys(self, topics, difficulty_range):
+        # Keys of the (topic, difficulty) buckets matching the filters
+        levels = self._difficulty_filter(difficulty_range)
+        if levels is not None and not levels:
+            return set()  # A range containing no known level matches nothing
+        return self.buckets.keys_for(topics, levels)
+
+    def _filter_ids(self, topics, difficulty_range):
+        # Frozenset of question IDs matching the topic and difficulty filters, or None when there is no filter
+        # Results come from the query cache when possible; otherwise the matching buckets are joined and cached.
+        levels = self._difficulty_filter(difficulty_range)
+        if not topics and levels is None:
+            return None
+        if levels is not None and not levels:
+            return frozenset()  # A range containing no known level matches nothing
+        key = QueryCache.key(topics, levels)  # Ranges are cached by the levels they cover, so new levels cause a miss
+        result_ids = self.query_cache.get(key)
+        if result_ids is None:
+            keys = self.buckets.keys_for(topics, levels)  # Buckets never overlap, so no intersection is needed
+            result_ids = frozenset(chain.from_iterable(self.buckets.buckets[bucket_key] for bucket_key in keys))
+            self.query_cache.put(key, result_ids)
+        return result_ids
+
+    def delete_question(self, question_id):
+        # Delete a question from the question bank
+        if question_id in self.questions:
+            self._remove(question_id)
+            self._log_delete(question_id)  # Record the deletion in the journal when journaling is enabled
+            print(f"Question {question_id} deleted.")  # Print a message confirming deletion
+        else:
+            print("Question not found.")  # Print a message if the question ID does not exist
+
+    def _remove(self, question_id):
+        # Remove a question and its index entries, without touching the journal
+        question_info = self.questions.pop(question_id)  # Remove the question from the dictionary
+        self.topics[question_info['topic']].remove(question_id)  # Remove the question ID from the topic set
+        self.difficulty_levels[question_info['difficulty']].remove(question_id)  # Remove the question ID from the difficulty level set
+        self.buckets.remove(question_id, question_info['topic'], question_info['difficulty'])  # Remove the question from its bucket
+        self.query_cache.invalidate(question_info['topic'], question_info['difficulty'])  # Cached searches covering this bucket are now stale
+        self._unindex_text(question_id, question_info['question'])  # Remove the question's words from the text index
+        self._unindex_duplicates(question_id, question_info['question'])  # Remove the question from duplicate checks
+
+    def random_question(self, topic=None, difficulty=None):
+        # Retrieve a random question based on optional topic and difficulty filters
+        # difficulty is either one exact level or a DifficultyRange
+        if difficulty and not isinstance(difficulty, DifficultyRange):
+            difficulty = [difficulty]
+        keys = self._bucket_keys([topic] if topic else None, difficulty)  # Buckets matching the filters
+        random_id = self.buckets.choice(keys)  # Pick uniformly among the questions in those buckets
+        if random_id is not None:
+            return self.questions[random_id]  # Return the details of the selected question
+        else:
+            return None  # Return None if no questions match the filters
+
+    def sample_questions(self, k, topics=None, difficulty_range=None, quotas=None, weights=None, group_by="topic"):
+        # Draw k distinct question IDs at random, for example to build an exam
+        # topics and difficulty_range restrict the candidates like search_questions does.
+        # quotas maps a topic (or a difficulty level when group_by="difficulty") to an exact number of questions;
+        # the rest of the k questions are drawn from all candidates. weights maps a topic or difficulty level to a
+        # relative weight that scales the chance of its questions being drawn (unlisted groups weigh 1).
+        # Raises ValueError if there are not enough matching questions.
+        if group_by not in ("topic", "difficulty"):
+            raise ValueError(f"Unknown grouping: {group_by}")
+        group_of = operator.itemgetter(0 if group_by == "topic" else 1)  # Bucket keys are (topic, difficulty) pairs
+        keys = self._bucket_keys(topics, difficulty_range)
+
+        quota_ids = {}
+        if quotas:
+            remaining = k - sum(quotas.values())
+            if remaining < 0:
+                raise ValueError("The quotas ask for more than k questions.")
+            for group, count in quotas.items():
+                group_keys = [key for key in keys if group_of(key) == group]
+                quota_ids[group] = self.buckets.sample(count, group_keys, group_of)  # Quotas are filled uniformly within their group
+        else:
+            remaining = k
+        drawn = [q_id for question_ids in quota_ids.values() for q_id in question_ids]
+        drawn += self.buckets.sample(remaining, keys, group_of, weights, exclude=quota_ids)
+        random.shuffle(drawn)  # Do not leave the quota questions bunched together
+        return drawn
+
+    def statistics(self, difficulty_range=None):
+        # Generate statistics about the question bank
+        # With difficulty_range (a list of levels or a DifficultyRange), only questions in those levels are counted
+        # An empty list does not filter anything, as in search_questions
+        if isinstance(difficulty_range, DifficultyRange) or difficulty_range:
+            return self._range_statistics(difficulty_range)
+        total_questions = len(self.questions)  # Count the total number of questions
+        topic_distribution = {topic: len(ids) for topic, ids in self.topics.items()}  # Count questions per topic
+        difficulty_distribution = {difficulty: len(ids) for difficulty, ids in self.difficulty_levels.items()}  # Count questions per difficulty level
+        return {
+            "total_questions": total_questions,  # Total number of questions
+            "topic_distribution": topic_distribution,  # Distribution of questions by topic
+            "difficulty_distribution": difficulty_distribution  # Distribution of questions by difficulty level
+        }
+
+    def _range_statistics(self, difficulty_range):
+        # Statistics restricted to some difficulty levels, counted from bucket sizes
+        topic_distribution = {}
+        for topic, difficulty in self._bucket_keys(None, difficulty_range):
+            topic_distribution[topic] = topic_distribution.get(topic, 0) + len(self.buckets.buckets[(topic, difficulty)])
+        levels = self._difficulty_filter(difficulty_range) or []
+        difficulty_distribution = {difficulty: len(self.difficulty_levels.get(difficulty, ())) for difficulty in levels}
+        return {
+            "total_questions": sum(difficulty_distribution.values()),  # Number of questions in the selected levels
+            "topic_distribution": topic_distribution,  # Distribution of those questions by topic
+            "difficulty_distribution": difficulty_distribution  # Distribution of those questions by difficulty level
+        }
+
+    def count_questions(self, topics=None, difficulty_range=None):
+        # Number of questions matching the filters, computed from bucket sizes without building any question
+        if not topics and self._difficulty_filter(difficulty_range) is None:
+            return len(self.questions)
+        return sum(len(self.buckets.buckets[key]) for key in self._bucket_keys(topics, difficulty_range))
+
+    def iter_by_difficulty(self, difficulty_range=None, reverse=False):
+        # Yield question IDs ordered by difficulty (descending when reverse), optionally limited to a DifficultyRange
+        for difficulty in self.difficulty_order.levels(difficulty_range, reverse):
+            yield from self.difficulty_levels[difficulty]
+
+    def _log_put(self, question_id):
+        # Append the current version of a question to the change journal
+        if self.journal is not None:
+            self.journal.record_put(question_id, self.questions[question_id])
+
+    def _log_delete(self, question_id):
+        # Append a deletion to the change journal
+        if self.journal is not None:
+            self.journal.record_delete(question_id)
+
+    def _apply_journal_record(self, record):
+        # Replay one journal record on top of the loaded snapshot
+        if record['op'] == 'batch':
+            for inner_record in record['records']:
+                self._apply_journal_record(inner_record)
+            return
+        question_id = record['id']
+        if record['op'] == 'delete':
+            if question_id in self.questions:  # Deletions may be replayed twice after a crash during compaction
+                self._remove(question_id)
+        else:
+            # A put holds the whole question, so it replaces the stored version rather than updating it field by field
+            if question_id in self.questions:
+                self._remove(question_id)
+            self._insert(question_id, record['question'], record['topic'], record['difficulty'])
+
+    def save_to_file(self, filename):
+        # Save all questions to a CSV file
+        # With a journal attached to this file, only the changes made since the last save are written out
+        if self.journal is None:
+            self._write_snapshot(filename)
+            if os.path.exists(ChangeJournal.path_for(filename)):
+                os.remove(ChangeJournal.path_for(filename))  # A journal left by an earlier journaled save is already folded in
+            return
+        journal_path = ChangeJournal.path_for(filename)
+        if self.journal.path == journal_path and os.path.exists(filename) and not self.journal.needs_compaction(len(self.questions)):
+            self.journal.flush()  # The snapshot is current up to the journal, so appending the changes is enough
+        else:
+            self.compact(filename)
+
+    def compact(self, filename):
+        # Fold the change journal into a fresh snapshot and start an empty journal next to it
+        self._write_snapshot(filename)
+        if self.journal is not None:
+            self.journal.attach(ChangeJournal.path_for(filename), truncate=True)
+
+    def _clear(self):
+        # Empty the bank and every index before a reload
+        self.questions.clear()  # Clear the existing questions
+        self.topics.clear()  # Clear the existing topics
+        self.difficulty_levels.clear()  # Clear the existing difficulty levels
+        self.buckets.clear()  # Clear the existing sampling buckets
+        self.difficulty_order.clear()  # Clear the existing difficulty ordering
+        self.query_cache.clear()  # Every cached search is stale after a reload
+        if self.text_index is not None:
+            self.text_index.clear()  # Clear the existing text index
+        self.text_pending.clear()
+        if self.duplicate_index is not None:
+            self.duplicate_index.clear()  # Clear the existing duplicate signatures
+        self.duplicate_pending.clear()
+        self.next_id = 1  # The loaded file decides where the ID allocator continues
+
+    @staticmethod
+    def _report_progress(lines, total_size, progress, every=10000):
+        # Pass file lines through unchanged, reporting the approximate fraction read every few thousand lines
+        done = 0
+        for count, line in enumerate(lines, 1):
+            done += len(line)
+            if count % every == 0:
+                progress(min(done / max(total_size, 1), 1.0))
+            yield line
+        progress(1.0)
+
+    def _write_snapshot(self, filename):
+        # Write every question to a temporary file, then swap it into place so a crash never leaves a half-written file
+        # File names ending in BinarySnapshot.EXTENSION get the binary format, everything else CSV
+        temp_filename = filename + ".tmp"
+        if filename.endswith(BinarySnapshot.EXTENSION):
+            try:
+                with open(temp_filename, 'wb') as file:
+                    BinarySnapshot.write(file, self)
+                    file.flush()
+                    os.fsync(file.fileno())  # Make sure the data is on disk before the old snapshot is replaced
+            except ValueError:
+                os.remove(temp_filename)  # Do not leave a partial snapshot behind
+                raise
+            self._release_file(filename)
+            os.replace(temp_filename, filename)  # Atomically replace the old snapshot
+            return
+        with open(temp_filename, 'w', newline='') as file:  # Open the temporary file in write mode
+            writer = csv.writer(file)  # Create a CSV writer object
+            writer.writerow(['ID', 'Question', 'Topic', 'Difficulty', f'NextID={self.next_id}'])  # Write the header row, with the ID allocator's position
+            for q_id, question in self.questions.items():
+                # Write each question's details to the file
+                writer.writerow([q_id, question['question'], question['topic'], question['difficulty']])
+            file.flush()
+            os.fsync(file.fileno())  # Make sure the data is on disk before the old snapshot is replaced
+        self._release_file(filename)
+        os.replace(temp_filename, filename)  # Atomically replace the old snapshot
+
+    def _release_file(self, filename):
+        # Let go of filename before it is replaced, in case the columnar store still maps it from a binary load
+        if isinstance(self.questions, ColumnarQuestionStore):
+            self.questions.release_file(filename)
+
+    def load_from_file(self, filename, progress=None, detect_duplicates=False):
+        # Load questions from a CSV file or a binary snapshot, then replay the change journal saved next to it, if any
+        # progress, when given, is called from time to time with the fraction of the file read so far
+        # detect_duplicates=True runs find_near_duplicates on the loaded bank and returns its clusters
+        if BinarySnapshot.is_binary(filename):
+            self._load_binary(filename, progress)
+        else:
+            self._load_csv(filename, progress)
+
+        journal_path = ChangeJournal.path_for(filename)
+        records, valid_size = ChangeJournal.read(journal_path)
+        for record in records:
+            self._apply_journal_record(record)  # Bring the snapshot up to date with the logged changes
+        if self.journal is not None:
+            self.journal.attach(journal_path, valid_size=valid_size, logged=len(records))  # Keep appending to the same journal
+        if detect_duplicates:
+            return self.find_near_duplicates()
+
+    def _load_binary(self, filename, progress):
+        # Open a binary snapshot: columns are copied as whole arrays and the buckets come back one group at a time
+        snapshot = BinarySnapshot(filename)
+        self._clear()
+        ids = snapshot.array("ids", 'q')
+        store = ColumnarQuestionStore.from_snapshot(snapshot, ids)
+        if self.storage == "columnar":
+            self.questions = store  # Question text is decoded only when a question is read
+        else:
+            for q_id in ids:
+                self.questions[q_id] = store[q_id]  # The dict layout needs every question built up front
+        if progress:
+            progress(0.5)
+        topic_names, difficulty_names = snapshot.names("topic_names"), snapshot.names("difficulty_names")
+        buckets, bucket_ids = snapshot.array("buckets", 'Q'), snapshot.array("bucket_ids", 'q')
+        for index in range(0, len(buckets), 4):
+            topic_code, difficulty_code, start, count = buckets[index:index + 4]
+            key = (topic_names[topic_code], difficulty_names[difficulty_code])
+            self._index_groups({key: bucket_ids[start:start + count].tolist()})
+        if self.text_index is not None:
+            self.text_pending.update(ids)  # Words are indexed on the first search_text
+        if self.duplicate_index is not None:
+            self.duplicate_pending.update(ids)  # Signatures are computed on the first duplicate check
+        self.next_id = snapshot.next_id
+        if progress:
+            progress(1.0)
+
+    def _load_csv(self, filename, progress):
+        # Parse a CSV file row by row
+        with open(filename, 'r', newline='') as file:  # Open the file in read mode
+            lines = self._report_progress(file, os.path.getsize(filename), progress) if progress else file
+            reader = csv.reader(lines)  # Create a CSV reader object
+            header = next(reader)  # Read the header row
+            self._clear()
+            if len(header) > 4 and header[4].startswith('NextID='):
+                self.next_id = int(header[4][len('NextID='):])  # Restore the ID allocator, which may be ahead of every stored ID
+            chunk = {}  # Rows waiting to be added in one batch, by ID
+            highest_id = 0
+            for row in reader:
+                q_id = int(row[0])  # Convert the ID to an integer
+                if q_id > highest_id:
+                    highest_id = q_id
+                if q_id in chunk or q_id in self.questions:
+                    # A repeated ID replaces the earlier row, as it would with one add per row
+                    self._insert_many(list(chunk.values()))
+                    chunk = {}
+                    if q_id in self.questions:
+                        self._remove(q_id)
+                chunk[q_id] = (q_id, row[1], row[2], row[3])  # Extract question details
+                if len(chunk) >= self.LOAD_BATCH_ROWS:
+                    self._insert_many(list(chunk.values()))  # Add the questions a batch at a time
+                    chunk = {}
+            self._insert_many(list(chunk.values()))
+            self._note_id(highest_id)  # Files written without NextID continue after their highest ID
+
+def convert_file(source, target):
+    # Convert a question bank file between CSV and the binary snapshot format, replaying any journal of the source
+    # The format of target is chosen by its extension, as in save_to_file
+    bank = QuestionBank(storage="columnar", text_index=False)
+    bank.load_from_file(source)
+    bank.save_to_file(target)
+
+class VirtualListView(tk.Frame):
+    # A scrolling list that only creates Listbox rows for the questions currently on screen.
+    # It holds the question IDs in sorted order and formats a row only when it becomes visible, so scrolling
+    # through a huge bank and changing one question both cost a screenful of work at most.
+    def __init__(self, master, format_row, **listbox_options):
+        super().__init__(master, bg=master.cget("bg"))
+        self.format_row = format_row  # Function that turns a question ID into the text of its row
+        self.row_ids = []  # Question IDs of every row, in ascending order
+        self.first = 0  # Index in row_ids of the top visible row
+        self.visible = 1  # Number of rows that fit in the Listbox
+
+        self.listbox = tk.Listbox(self, **listbox_options)
+        self.scrollbar = tk.Scrollbar(self, orient=tk.VERTICAL, command=self.yview)
+        self.listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)  # Pack the listbox to the left side
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)  # Pack the scrollbar to the right side
+
+        self.row_height = tkfont.Font(font=self.listbox.cget("font")).metrics("linespace") + 1  # Pixel height of one row
+        self.listbox.bind("<Configure>", self.on_resize)  # Recompute the number of visible rows when the window is resized
+        self.listbox.bind("<MouseWheel>", self.on_mouse_wheel)  # Windows and macOS wheel events
+        self.listbox.bind("<Button-4>", lambda event: self.scroll(-3))  # X11 wheel up
+        self.listbox.bind("<Button-5>", lambda event: self.scroll(3))  # X11 wheel down
+
+    def on_resize(self, event):
+        # Fit as many rows as the new height allows
+        self.visible = max(1, event.height // self.row_height)
+        self.render()
+
+    def on_mouse_wheel(self, event):
+        # Scroll three rows per wheel notch and stop the Listbox from scrolling itself
+        self.scroll(-3 if event.delta > 0 else 3)
+        return "break"
+
+    def yview(self, *args):
+        # Handle scrollbar drags ("moveto") and arrow or trough clicks ("scroll")
+        if args[0] == tk.MOVETO:
+            self.scroll_to(int(float(args[1]) * len(self.row_ids)))
+        elif args[0] == tk.SCROLL:
+            step = self.visible if args[2] == tk.PAGES else 1
+            self.scroll(int(args[1]) * step)
+
+    def scroll(self, rows):
+        # Move the view by a number of rows
+        self.scroll_to(self.first + rows)
+
+    def scroll_to(self, first):
+        # Show the rows starting at index first, clamped to the list
+        first = max(0, min(first, len(self.row_ids) - self.visible))
+        if first != self.first:
+            self.first = first
+            self.render()
+
+    def render(self):
+        # Rebuild the Listbox from the visible slice of rows and move the scrollbar to match
+        self.first = max(0, min(self.first, len(self.row_ids) - self.visible))
+        self.listbox.delete(0, tk.END)
+        for q_id in self.row_ids[self.first:self.first + self.visible]:
+            self.listbox.insert(tk.END, self.format_row(q_id))
+        self.update_scrollbar()
+
+    def update_scrollbar(self):
+        # Size and place the scrollbar thumb for the visible slice
+        total = len(self.row_ids)
+        if total <= self.visible:
+            self.scrollbar.set(0.0, 1.0)
+        else:
+            self.scrollbar.set(self.first / total, (self.first + self.visible) / total)
+
+    def set_rows(self, question_ids):
+        # Replace every row; question_ids must already be sorted
+        self.row_ids = list(question_ids)
+        self.first = 0
+        self.render()
+
+    def extend(self, question_ids):
+        # Append a sorted chunk of IDs that all come after the current rows
+        was_short = len(self.row_ids) < self.first + self.visible
+        self.row_ids.extend(question_ids)
+        if was_short:
+            self.render()  # The new rows may appear on screen
+        else:
+            self.update_scrollbar()
+
+    def insert_row(self, question_id):
+        # Add one row in ID order, touching the Listbox only if the row is on screen
+        index = bisect.bisect_left(self.row_ids, question_id)
+        if index < len(self.row_ids) and self.row_ids[index] == question_id:
+            self.update_row(question_id)  # The ID is already listed, so its details were replaced
+            return
+        self.row_ids.insert(index, question_id)
+        position = index - self.first
+        if position < 0:
+            self.first += 1  # Keep the same questions on screen
+        elif position < self.visible:
+            self.listbox.insert(position, self.format_row(question_id))
+            if self.listbox.size() > self.visible:
+                self.listbox.delete(tk.END)  # The bottom row was pushed off screen
+        self.update_scrollbar()
+
+    def update_row(self, question_id):
+        # Reformat one row if it is on screen
+        index = bisect.bisect_left(self.row_ids, question_id)
+        position = index - self.first
+        if index < len(self.row_ids) and self.row_ids[index] == question_id and 0 <= position < self.visible:
+            self.listbox.delete(position)
+            self.listbox.insert(position, self.format_row(question_id))
+
+    def remove_row(self, question_id):
+        # Remove one row, touching the Listbox only if the row is on screen
+        index = bisect.bisect_left(self.row_ids, question_id)
+        if index == len(self.row_ids) or self.row_ids[index] != question_id:
+            return
+        del self.row_ids[index]
+        position = index - self.first
+        if position < 0:
+            self.first -= 1  # Keep the same questions on screen
+        elif position < self.visible:
+            self.listbox.delete(position)
+            below = self.first + self.visible - 1
+            if below < len(self.row_ids):
+                self.listbox.insert(tk.END, self.format_row(self.row_ids[below]))  # Pull the next row up onto the screen
+            elif self.first > 0:
+                self.render()  # At the end of the list: scroll back so the view stays full
+                return
+        self.update_scrollbar()
+
+    def selected_id(self):
+        # Question ID of the selected row, or None
+        selection = self.listbox.curselection()
+        if not selection or self.first + selection[0] >= len(self.row_ids):
+            return None
+        return self.row_ids[self.first + selection[0]]
+
+class QuestionBankGUI:
+    LOAD_CHUNK_ROWS = 50000  # Rows handed to the list per step after a background load
+
+    def __init__(self, master, question_bank):
+        self.master = master  # Reference to the main window
+        self.question_bank = question_bank  # Reference to the QuestionBank instance
+        
+        self.master.geometry("900x600")  # Set the size of the window
+        self.master.title("Question Bank Management")  # Set the title of the window
+        self.master.configure(bg="#eaeaea")  # Set the background color of the window
+
+        # Define colors for various UI elements
+        self.primary_color = "#1abc9c"    # Bright teal color for primary elements
+        self.secondary_color = "#34495e"  # Dark blue-gray color for secondary elements
+        self.accent_color = "#e74c3c"     # Vivid red color for accents
+        self.button_color = "#3498db"     # Bright blue color for buttons
+        self.button_text_color = "#ffffff"  # White text color for buttons
+        self.listbox_bg = "#ffffff"       # White background for the listbox
+        self.listbox_fg = "#2c3e50"       # Dark text color for the listbox
+
+        # Create and place frames within the main window
+        self.main_frame = tk.Frame(master, bg=self.primary_color, padx=20, pady=20)
+        self.main_frame.pack(pady=20, fill=tk.BOTH, expand=True)  # Pack the main frame with padding and expand to fill available space
+
+        self.button_frame = tk.Frame(self.main_frame, bg=self.secondary_color, padx=10, pady=10)
+        self.button_frame.pack(pady=10, fill=tk.X)  # Pack the button frame with padding and fill horizontally
+
+        self.list_frame = tk.Frame(self.main_frame, bg=self.primary_color, padx=10, pady=10)
+        self.list_frame.pack(pady=10, fill=tk.BOTH, expand=True)  # Pack the list frame with padding and expand to fill available space
+
+        # Create buttons with improved styles and add them to the button frame
+        self.buttons = []  # Every button, so they can be disabled while a file is loading
+        self.create_button("Delete Question", self.delete_question_prompt).grid(row=0, column=0, padx=10, pady=5, sticky="ew")
+        self.create_button("Add Question", self.add_question).grid(row=0, column=1, padx=10, pady=5, sticky="ew")
+        self.create_button("Update Question", self.update_question_prompt).grid(row=0, column=2, padx=10, pady=5, sticky="ew")
+        self.create_button("Search Question", self.search_question_prompt).grid(row=1, column=0, padx=10, pady=5, sticky="ew")
+        self.create_button("Random Question", self.random_question_prompt).grid(row=1, column=1, padx=10, pady=5, sticky="ew")
+        self.create_button("Statistics", self.show_statistics).grid(row=1, column=2, padx=10, pady=5, sticky="ew")
+        self.create_button("Save", self.save_questions).grid(row=2, column=0, padx=10, pady=5, sticky="ew")
+        self.create_button("Load", self.load_questions).grid(row=2, column=1, padx=10, pady=5, sticky="ew")
+
+        # Create a label that shows loading progress
+        self.status_label = tk.Label(self.button_frame, text="", bg=self.secondary_color, fg=self.button_text_color, font=("Helvetica", 12))
+        self.status_label.grid(row=2, column=2, padx=10, pady=5, sticky="ew")
+
+        # Create a virtual list with a scrollbar that only draws the visible questions
+        self.questions_list = VirtualListView(self.list_frame, self.format_question, bg=self.listbox_bg, fg=self.listbox_fg, font=("Helvetica", 12), selectbackground=self.accent_color, selectforeground=self.listbox_bg)
+        self.questions_list.pack(fill=tk.BOTH, expand=True)  # Pack the list to fill the list frame
+
+        self.load_events = queue.Queue()  # Progress messages from the background loading thread
+        self.pending_rows = []  # Sorted question IDs still to be handed to the list after a load
+
+        self.refresh_questions()  # Refresh the listbox with the current questions
+
+    def create_button(self, text, command):
+        # Create a button with the specified text and command
+        button = tk.Button(self.button_frame, text=text, command=command, width=20, bg=self.button_color, fg=self.button_text_color, font=("Helvetica", 12, "bold"), relief="raised", borderwidth=2)
+        self.buttons.append(button)
+        return button
+
+    def update_question_prompt(self):
+        # Prompt the user to update an existing question
+        question_id = simpledialog.askinteger("Input", "Enter the question ID to update:",
+                                              initialvalue=self.questions_list.selected_id())  # Ask for the question ID, offering the selected row
+        if question_id in self.question_bank.questions:
+            question = simpledialog.askstring("Input", "Enter the new question text (leave blank to keep current):")  # Ask for new question text
+            topic = simpledialog.askstring("Input", "Enter the new topic (leave blank to keep current):")  # Ask for new topic
+            difficulty = simpledialog.askstring("Input", "Enter the new difficulty (leave blank to keep current):")  # Ask for new difficulty level
+            self.question_bank.update_question(question_id, question, topic, difficulty)  # Update the question in the bank
+            self.questions_list.update_row(question_id)  # Redraw the updated row if it is on screen
+            messagebox.showinfo("Success", f"Question {question_id} updated.")  # Show a success message
+        else:
+            messagebox.showerror("Error", "Question ID not found.")  # Show an error message if the ID is not found
+
+    def search_question_prompt(self):
+        # Prompt the user to search for questions based on topic and difficulty
+        topics = simpledialog.askstring("Input", "Enter topics to search (comma-separated, leave blank if not searching by topic):")  # Ask for topics
+        difficulty_range = simpledialog.askstring("Input", "Enter difficulty levels to search (comma-separated or a range like 3..7, leave blank if not searching by difficulty):")  # Ask for difficulty levels
+
+        if topics:
+            topics = [topic.strip() for topic in topics.split(",")]  # Split and strip the topic list
+        else:
+            topics = None  # If no topics are provided, set to None
+
+        if difficulty_range and ".." in difficulty_range:
+            low, high = (bound.strip() or None for bound in difficulty_range.split("..", 1))  # "3..7" searches a range of levels
+            difficulty_range = DifficultyRange(low, high)
+        elif difficulty_range:
+            difficulty_range = [difficulty.strip() for difficulty in difficulty_range.split(",")]  # Split and strip the difficulty list
+        else:
+            difficulty_range = None  # If no difficulty levels are provided, set to None
+
+        results = self.question_bank.search_questions(topics=topics, difficulty_range=difficulty_range)  # Search for questions
+        if results:
+            result_text = "\n".join([f"Question: {q['question']}, Topic: {q['topic']}, Difficulty: {q['difficulty']}" for q in results])  # Format the results
+            messagebox.showinfo("Search Results", result_text)  # Show the search results in a message box
+        else:
+            messagebox.showinfo("Search Results", "No matching questions found.")  # Show a message if no results are found
+
+    def random_question_prompt(self):
+        # Prompt the user to get a random question based on optional filters
+        topic = simpledialog.askstring("Input", "Enter the topic (leave blank for any topic):")  # Ask for a topic
+        difficulty = simpledialog.askstring("Input", "Enter the difficulty level (leave blank for any difficulty):")  # Ask for a difficulty level
+
+        question = self.question_bank.random_question(topic=topic, difficulty=difficulty)  # Get a random question
+        if question:
+            messagebox.showinfo("Random Question", f"Question: {question['question']}, Topic: {question['topic']}, Difficulty: {question['difficulty']}")  # Show the random question
+        else:
+            messagebox.showinfo("Random Question", "No matching questions found.")  # Show a message if no questions match
+
+    def show_statistics(self):
+        # Show statistics about the question bank
+        stats = self.question_bank.statistics()  # Get the statistics
+        stats_text = f"Total Questions: {stats['total_questions']}\n"  # Format the total number of questions
+        stats_text += "Topic Distribution:\n"
+        for topic, count in stats['topic_distribution'].items():
+            stats_text += f"  {topic}: {count}\n"  # Format the distribution of questions by topic
+        stats_text += "Difficulty Distribution:\n"
+        for difficulty, count in stats['difficulty_distribution'].items():
+            stats_text += f"  {difficulty}: {count}\n"  # Format the distribution of questions by difficulty
+        messagebox.showinfo("Statistics", stats_text)  # Show the statistics in a message box
+
+    def save_questions(self):
+        # Save all questions to a CSV file
+        filename = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV files", "*.csv"), ("Binary snapshots", "*" + BinarySnapshot.EXTENSION)], title="Save as")  # Ask for a filename to save
+        if filename:
+            self.question_bank.save_to_file(filename)  # Save the questions to the specified file
+            messagebox.showinfo("Success", f"Questions saved successfully to {filename}.")  # Show a success message
+        else:
+            messagebox.showerror("Error", "Filename cannot be empty.")  # Show an error message if the filename is empty
+
+    def load_questions(self):
+        # Load questions from a CSV file
+        filename = filedialog.askopenfilename(filetypes=[("CSV files", "*.csv"), ("Binary snapshots", "*" + BinarySnapshot.EXTENSION)], title="Open file")  # Ask for a filename to open
+        if filename:
+            if os.path.exists(filename):
+                self.start_loading(filename)  # Load the questions in the background
+            else:
+                messagebox.showerror("Error", "File not found.")  # Show an error message if the file does not exist
+        else:
+            messagebox.showerror("Error", "Filename cannot be empty.")  # Show an error message if the filename is empty
+
+    def start_loading(self, filename):
+        # Load a file on a background thread while the window keeps responding
+        self.set_busy(True)  # Nothing may touch the bank while it is being replaced
+        self.questions_list.set_rows([])
+        self.status_label.config(text="Loading... 0%")
+        threading.Thread(target=self.load_worker, args=(filename,), daemon=True).start()
+        self.master.after(100, self.poll_loading)
+
+    def load_worker(self, filename):
+        # Runs on the loading thread: load the bank and report progress through the queue, never touching Tk
+        try:
+            self.question_bank.load_from_file(filename, progress=lambda fraction: self.load_events.put(("progress", fraction)))
+            if self.question_bank.duplicate_index is not None:
+                self.load_events.put(("status", "Preparing duplicate checks..."))
+                self.question_bank.flush_duplicate_index()  # Hash the loaded questions here, not on the first Add
+            self.load_events.put(("done", sorted(self.question_bank.questions)))  # Sort here so the window does not have to
+        except Exception as error:
+            self.load_events.put(("error", error))
+
+    def poll_loading(self):
+        # Runs on the main loop: apply progress messages from the loading thread
+        while True:
+            try:
+                kind, value = self.load_events.get_nowait()
+            except queue.Empty:
+                self.master.after(100, self.poll_loading)  # Check again shortly
+                return
+            if kind == "progress":
+                self.status_label.config(text=f"Loading... {value:.0%}")
+            elif kind == "status":
+                self.status_label.config(text=value)
+            elif kind == "done":
+                self.pending_rows = value
+                self.master.after_idle(lambda: self.feed_rows(0))  # Hand the rows to the list in chunks
+                return
+            else:
+                self.refresh_questions()  # The bank may hold part of the file; show whatever it has now
+                self.set_busy(False)
+                self.status_label.config(text="")
+                messagebox.showerror("Error", f"Could not load the file: {value}")  # Show an error message if loading failed
+                return
+
+    def feed_rows(self, start):
+        # Runs on the main loop: add one chunk of loaded rows to the list, then yield to other events
+        end = start + self.LOAD_CHUNK_ROWS
+        self.questions_list.extend(self.pending_rows[start:end])
+        total = len(self.pending_rows)
+        if end < total:
+            self.status_label.config(text=f"Showing {end} of {total}")
+            self.master.after(1, lambda: self.feed_rows(end))
+            return
+        self.pending_rows = []
+        self.set_busy(False)
+        self.status_label.config(text=f"{total} questions")
+        messagebox.showinfo("Success", "Questions loaded successfully.")  # Show a success message
+
+    def set_busy(self, busy):
+        # Disable or re-enable every button
+        for button in self.buttons:
+            button.config(state=tk.DISABLED if busy else tk.NORMAL)
+
+    def format_question(self, q_id):
+        # Text of the list row for one question
+        question = self.question_bank.questions[q_id]
+        return f"ID: {q_id}, Question: {question['question']}, Topic: {question['topic']}, Difficulty: {question['difficulty']}"
+
+    def refresh_questions(self):
+        # Reload every row of the list from the question bank; rows are only formatted when they are shown
+        self.questions_list.set_rows(sorted(self.question_bank.questions))
+
+    def add_question(self):
+        # Prompt the user to add a new question
+        question = simpledialog.askstring("Input", "Enter the question:")  # Ask for the question text
+        topic = simpledialog.askstring("Input", "Enter the topic:")  # Ask for the topic
+        difficulty = simpledialog.askstring("Input", "Enter the difficulty level:")  # Ask for the difficulty level
+        if self.question_bank.duplicate_index is not None:
+            duplicates = self.question_bank.similar_questions(question)  # Look for questions that say much the same thing
+        else:
+            duplicates = []  # Without the index a check would hash the whole bank on every Add
+        if duplicates:
+            listed = ", ".join(f"{q_id} ({score:.0%} similar)" for q_id, score in duplicates[:5])
+            if not messagebox.askyesno("Possible duplicate", f"This looks like question {listed}. Add it anyway?"):
+                return
+        question_id = self.question_bank.allocate_id()  # Get an ID that no question has used before
+        self.question_bank.add_question(question_id, question, topic, difficulty)  # Add the new question to the question bank
+        self.questions_list.insert_row(question_id)  # Show the new question if its row is on screen
+
+    def delete_question_prompt(self):
+        # Prompt the user to delete a question
+        question_id = simpledialog.askinteger("Input", "Enter the question ID to delete:",
+                                              initialvalue=self.questions_list.selected_id())  # Ask for the question ID, offering the selected row
+        if question_id in self.question_bank.questions:
+            self.question_bank.delete_question(question_id)  # Delete the question from the bank
+            self.questions_list.remove_row(question_id)  # Remove the row, redrawing only if it is on screen
+            messagebox.showinfo("Success", f"Question {question_id} deleted.")  # Show a success message
+        else:
+            messagebox.showerror("Error", "Question ID not found.")  # Show an error message if the ID is not found
+
+if __name__ == "__main__":
+    root = tk.Tk()  # Create the main application window
+    question_bank = QuestionBank()  # Create a QuestionBank instance
+    app = QuestionBankGUI(root, question_bank)  # Create the GUI with the question bank
+    root.mainloop()  # Start the main event loop to run the application
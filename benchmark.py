@@ -0,0 +1,305 @@
+import argparse  # Import argparse to read benchmark options from the command line
+import contextlib  # Import contextlib to silence the messages printed by delete_question
+import datetime  # Import datetime to timestamp suite results
+import heapq  # Import heapq so the linear-scan baseline ranks results the same way
+import io  # Import io for the buffer that swallows printed messages
+import itertools  # Import itertools to precompute cumulative word weights
+import json  # Import json to write and read machine-readable suite results
+import os  # Import os to report file sizes
+import platform  # Import platform to record where suite results were measured
+import random  # Import random to build reproducible synthetic question text
+import sys  # Import sys to write suite results to standard output
+import tempfile  # Import tempfile for the files written by the startup and suite benchmarks
+import time  # Import time to measure how long each operation takes
+import tracemalloc  # Import tracemalloc to measure how much memory each layout allocates
+
+from DSA1 import (BinarySnapshot, DifficultyRange, Instrumentation, QuestionBank, TextIndex,
+                  convert_file)  # Import the structures being measured
+
+VOCABULARY = [f"word{i}" for i in range(5000)]  # Synthetic words; low numbers are drawn far more often than high ones
+WORD_WEIGHTS = list(itertools.accumulate(1 / (rank + 1) for rank in range(len(VOCABULARY))))  # Cumulative Zipf-like word frequencies
+
+def synthetic_text(rng, length=10):
+    # Build a question sentence from the synthetic vocabulary
+    return " ".join(rng.choices(VOCABULARY, cum_weights=WORD_WEIGHTS, k=length)) + "?"
+
+def synthetic_rows(count, topic_count=50, difficulty_count=10, seed=0, difficulty_skew=0.0, first_id=1):
+    # Generate question rows the way load_from_file sees them: every row carries its own fresh strings
+    # With difficulty_skew 0 every difficulty is equally common; larger values make low difficulties dominate,
+    # difficulty d being drawn with weight 1 / d ** difficulty_skew.
+    rng = random.Random(seed)
+    difficulty_weights = list(itertools.accumulate(1 / level ** difficulty_skew for level in range(1, difficulty_count + 1)))
+    for q_id in range(first_id, first_id + count):
+        question = synthetic_text(rng)
+        topic = f"Topic {q_id % topic_count}"  # A new string object per row, just like csv.reader produces
+        if difficulty_skew:
+            difficulty = str(rng.choices(range(1, difficulty_count + 1), cum_weights=difficulty_weights)[0])
+        else:
+            difficulty = str(q_id // topic_count % difficulty_count + 1)  # Every topic gets every difficulty
+        yield q_id, question, topic, difficulty
+
+def measure_memory(storage, count):
+    # Fill a whole QuestionBank with synthetic rows and return the number of bytes it holds on to, indexes included
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    bank = QuestionBank(storage=storage, text_index=False)  # The text index costs the same with either layout
+    for row in synthetic_rows(count):
+        bank.add_question(*row)
+    used = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    return used
+
+def compare_memory(count):
+    # Compare a bank using the dict-of-dicts layout with one using the columnar layout for the same rows
+    dict_bytes = measure_memory("dict", count)
+    columnar_bytes = measure_memory("columnar", count)
+    print(f"Rows: {count} (whole bank, text index off)")
+    print(f"  dict-of-dicts: {dict_bytes / 2**20:9.1f} MiB ({dict_bytes / count:6.1f} bytes/question)")
+    print(f"  columnar:      {columnar_bytes / 2**20:9.1f} MiB ({columnar_bytes / count:6.1f} bytes/question)")
+    print(f"  ratio:         {dict_bytes / columnar_bytes:9.2f}x")
+
+def linear_text_search(bank, query, k=10):
+    # Baseline: scan every question and rank the ones sharing words with the query by how many they share
+    words = set(TextIndex.tokenize(query))
+    matches = []
+    for q_id, details in bank.questions.items():
+        shared = sum(1 for word in TextIndex.tokenize(details['question']) if word in words)
+        if shared:
+            matches.append((q_id, shared))
+    return heapq.nlargest(k, matches, key=lambda item: item[1])
+
+def compare_text_search(count, query_count):
+    # Time ranked queries through the inverted index against a linear scan of the bank
+    bank = QuestionBank(text_index=True)
+    for row in synthetic_rows(count):
+        bank.add_question(*row)
+    rng = random.Random(1)
+    queries = [" ".join(rng.choices(VOCABULARY[100:], k=2)) for _ in range(query_count)]  # Mid-frequency words
+    started = time.perf_counter()
+    for query in queries:
+        bank.search_text(query)
+    indexed = (time.perf_counter() - started) / query_count
+    started = time.perf_counter()
+    for query in queries:
+        linear_text_search(bank, query)
+    linear = (time.perf_counter() - started) / query_count
+    print(f"Rows: {count}, queries: {query_count}")
+    print(f"  inverted index: {indexed * 1000:9.3f} ms/query")
+    print(f"  linear scan:    {linear * 1000:9.3f} ms/query")
+    print(f"  speedup:        {linear / indexed:9.1f}x")
+
+def compare_bulk_load(count, text_index):
+    # Time adding rows one add_question call at a time against a single add_many call
+    rows = list(synthetic_rows(count))
+    bank = QuestionBank(text_index=text_index)
+    started = time.perf_counter()
+    for row in rows:
+        bank.add_question(*row)
+    per_row = time.perf_counter() - started
+    bank = QuestionBank(text_index=text_index)
+    started = time.perf_counter()
+    bank.add_many(rows)
+    added = time.perf_counter() - started
+    if text_index:
+        bank.search_text("warm up")  # add_many leaves the words to be indexed by the first search; count that work too
+    bulk = time.perf_counter() - started
+    print(f"Rows: {count}, text index: {'on' if text_index else 'off'}")
+    print(f"  add_question loop: {per_row:8.3f} s")
+    print(f"  add_many:          {bulk:8.3f} s ({added:.3f} s in add_many, {bulk - added:.3f} s in the first search_text)")
+    print(f"  speedup:           {per_row / bulk:8.2f}x")
+
+def compare_startup(count):
+    # Time loading the same bank from CSV and from a binary snapshot, with each storage backend
+    with tempfile.TemporaryDirectory() as directory:
+        csv_path = os.path.join(directory, "bank.csv")
+        binary_path = os.path.join(directory, "bank" + BinarySnapshot.EXTENSION)
+        bank = QuestionBank(storage="columnar", text_index=False)
+        bank.add_many(synthetic_rows(count))
+        bank.save_to_file(csv_path)
+        started = time.perf_counter()
+        convert_file(csv_path, binary_path)
+        converted = time.perf_counter() - started
+        print(f"Rows: {count}")
+        print(f"  CSV file:    {os.path.getsize(csv_path) / 2**20:8.1f} MiB")
+        print(f"  binary file: {os.path.getsize(binary_path) / 2**20:8.1f} MiB (converted in {converted:.2f} s)")
+        for label, path in (("CSV", csv_path), ("binary", binary_path)):
+            for storage in ("dict", "columnar"):
+                bank = QuestionBank(storage=storage)
+                started = time.perf_counter()
+                bank.load_from_file(path)
+                loaded = time.perf_counter() - started
+                bank.random_question()  # First read after opening touches the question text
+                first_read = time.perf_counter() - started - loaded
+                print(f"  {label:6} -> {storage:8}: {loaded:8.3f} s to load, {first_read * 1000:7.3f} ms to the first question")
+
+def compare_duplicate_detection(count, processes):
+    # Time clustering a bank with reworded copies, in one process and across a pool, then the incremental check
+    rows = list(synthetic_rows(count))
+    rng = random.Random(2)
+    copies = []
+    for q_id, question, topic, difficulty in rng.sample(rows, max(1, count // 100)):
+        words = question.split()
+        words[rng.randrange(len(words))] = rng.choice(VOCABULARY)  # Reword one word of the copy
+        copies.append((None, " ".join(words), topic, difficulty))
+    bank = QuestionBank(text_index=False)
+    bank.add_many(rows + copies)
+    print(f"Rows: {count}, reworded copies: {len(copies)}")
+    for label, workers in (("in process", 1), (f"pool of {processes or os.cpu_count()}", processes)):
+        started = time.perf_counter()
+        clusters = bank.find_near_duplicates(processes=workers)
+        print(f"  find_near_duplicates, {label:12}: {time.perf_counter() - started:8.3f} s, {len(clusters)} clusters")
+    bank = QuestionBank(text_index=False, duplicate_index=True)
+    bank.add_many(rows)
+    started = time.perf_counter()
+    bank.similar_questions("warm up")  # The first check fingerprints every row added in bulk
+    print(f"  indexing {count} rows: {time.perf_counter() - started:8.3f} s")
+    started = time.perf_counter()
+    flagged = sum(1 for row in copies if bank.add_question(*((bank.allocate_id(),) + row[1:])))
+    per_add = (time.perf_counter() - started) / len(copies)
+    print(f"  add_question with duplicate check: {per_add * 1e6:8.1f} us/question, {flagged} of {len(copies)} flagged")
+
+SUITE_OPERATIONS = ("search_questions", "random_question", "statistics", "update_question", "add_question",
+                    "delete_question", "save_to_file", "load_from_file")  # Operations timed by the suite, in the order they run
+
+def suite_for_size(size, topic_count, difficulty_count, difficulty_skew, storage, repeat, seed, directory):
+    # Build one synthetic bank and time every suite operation on it; returns the result entry for this size
+    bank = QuestionBank(storage=storage)
+    started = time.perf_counter()
+    bank.add_many(synthetic_rows(size, topic_count, difficulty_count, seed, difficulty_skew))
+    built = time.perf_counter() - started
+    rng = random.Random(seed + 1)
+    topics = sorted(bank.topics)
+    levels = list(bank.difficulty_order.levels())
+    timer = Instrumentation()  # Same histograms as QuestionBank.enable_instrumentation, without timing the setup code
+    timed = {name: timer.wrap(name, getattr(bank, name)) for name in SUITE_OPERATIONS}
+
+    for _ in range(repeat):
+        # Mix single-topic, multi-topic and difficulty-range filters; the query cache is emptied so each call does the work
+        first, last = sorted(rng.sample(range(len(levels)), 2)) if len(levels) > 1 else (0, 0)  # levels is in numeric order
+        low, high = levels[first], levels[last]
+        bank.query_cache.clear()
+        timed["search_questions"](rng.sample(topics, rng.randint(1, min(3, len(topics)))), DifficultyRange(low, high))
+    for _ in range(repeat):
+        timed["random_question"](rng.choice(topics) if rng.random() < 0.5 else None)
+    for _ in range(max(1, repeat // 100)):
+        timed["statistics"]()
+    existing = rng.sample(sorted(bank.questions), min(repeat, size))
+    for q_id, question, topic, difficulty in synthetic_rows(len(existing), topic_count, difficulty_count, seed + 2, difficulty_skew):
+        timed["update_question"](existing[q_id - 1], question, topic, difficulty)
+    for row in synthetic_rows(repeat, topic_count, difficulty_count, seed + 3, difficulty_skew, first_id=bank.next_id):
+        timed["add_question"](*row)
+    with contextlib.redirect_stdout(io.StringIO()):  # delete_question confirms every deletion on standard output
+        for q_id in existing:
+            timed["delete_question"](q_id)
+
+    files = {}
+    for extension in (".csv", BinarySnapshot.EXTENSION):
+        path = os.path.join(directory, f"bank-{size}{extension}")
+        timer.wrap(f"save_to_file[{extension}]", bank.save_to_file)(path)
+        files[extension] = os.path.getsize(path)
+        loaded = QuestionBank(storage=storage)
+        timer.wrap(f"load_from_file[{extension}]", loaded.load_from_file)(path)
+        os.remove(path)
+    return {
+        "rows": size,
+        "build_s": built,
+        "file_bytes": files,
+        "operations": timer.report(),
+    }
+
+def run_suite(sizes, topic_count, difficulty_count, difficulty_skew, storage, repeat, seed):
+    # Run the suite for every bank size and return the results as one JSON-ready dictionary
+    results = {
+        "benchmark": "QuestionBank suite",
+        "started": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "parameters": {
+            "sizes": sizes, "topics": topic_count, "difficulties": difficulty_count,
+            "difficulty_skew": difficulty_skew, "storage": storage, "repeat": repeat, "seed": seed,
+        },
+        "results": [],
+    }
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            entry = suite_for_size(size, topic_count, difficulty_count, difficulty_skew, storage, repeat, seed, directory)
+            results["results"].append(entry)
+            print(f"Rows: {size} (built in {entry['build_s']:.2f} s)", file=sys.stderr)
+            for name, summary in entry["operations"].items():
+                print(f"  {name:28} {summary['calls']:6} calls  {summary['mean_us']:12.1f} us mean  "
+                      f"{summary['p99_us']:12.1f} us p99", file=sys.stderr)
+    return results
+
+def compare_suites(baseline_path, candidate_path):
+    # Print the change in mean latency of every operation between two saved suite runs
+    with open(baseline_path) as file:
+        baseline = json.load(file)
+    with open(candidate_path) as file:
+        candidate = json.load(file)
+    baseline_means = {(entry["rows"], name): summary["mean_us"]
+                      for entry in baseline["results"] for name, summary in entry["operations"].items()}
+    for entry in candidate["results"]:
+        print(f"Rows: {entry['rows']}")
+        for name, summary in entry["operations"].items():
+            before = baseline_means.get((entry["rows"], name))
+            if before is None:
+                print(f"  {name:28} {summary['mean_us']:12.1f} us mean  (not in baseline)")
+            else:
+                print(f"  {name:28} {before:12.1f} -> {summary['mean_us']:12.1f} us mean  "
+                      f"({summary['mean_us'] / before:6.2f}x)")
+
+def main():
+    # Parse the command line and run the requested benchmark
+    parser = argparse.ArgumentParser(description="QuestionBank benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+    memory = commands.add_parser("memory", help="compare the memory used by whole banks with the dict and columnar storage layouts")
+    memory.add_argument("--rows", type=int, default=1_000_000, help="number of questions to store")
+    text = commands.add_parser("text", help="compare ranked text search through the inverted index with a linear scan")
+    text.add_argument("--rows", type=int, default=100_000, help="number of questions in the bank")
+    text.add_argument("--queries", type=int, default=20, help="number of queries to time")
+    bulk = commands.add_parser("bulk", help="compare add_many with one add_question call per row")
+    bulk.add_argument("--rows", type=int, default=1_000_000, help="number of questions to add")
+    bulk.add_argument("--no-text-index", action="store_true", help="disable the text index in both banks")
+    startup = commands.add_parser("startup", help="compare loading a bank from CSV and from a binary snapshot")
+    startup.add_argument("--rows", type=int, default=1_000_000, help="number of questions in the bank")
+    duplicates = commands.add_parser("duplicates", help="time near-duplicate clustering and the incremental duplicate check")
+    duplicates.add_argument("--rows", type=int, default=100_000, help="number of questions in the bank")
+    duplicates.add_argument("--processes", type=int, default=None, help="worker processes (default: one per CPU)")
+    suite = commands.add_parser("suite", help="time the main QuestionBank operations over a range of bank sizes")
+    suite.add_argument("--sizes", type=lambda text: [int(size) for size in text.split(",")],
+                       default=[10_000, 100_000, 1_000_000, 10_000_000], help="comma-separated bank sizes")
+    suite.add_argument("--topics", type=int, default=50, help="number of distinct topics")
+    suite.add_argument("--difficulties", type=int, default=10, help="number of distinct difficulty levels")
+    suite.add_argument("--skew", type=float, default=0.0, help="difficulty skew; 0 is uniform, 1 or more favours easy questions")
+    suite.add_argument("--storage", choices=("dict", "columnar"), default="dict", help="question storage layout")
+    suite.add_argument("--repeat", type=int, default=1000, help="calls timed per operation")
+    suite.add_argument("--seed", type=int, default=0, help="seed for the synthetic bank and the operations")
+    suite.add_argument("--output", help="write the JSON results to this file instead of standard output")
+    compare = commands.add_parser("compare", help="compare two JSON files written by the suite")
+    compare.add_argument("baseline", help="results of the earlier run")
+    compare.add_argument("candidate", help="results of the later run")
+    args = parser.parse_args()
+
+    if args.command == "memory":
+        compare_memory(args.rows)
+    elif args.command == "text":
+        compare_text_search(args.rows, args.queries)
+    elif args.command == "bulk":
+        compare_bulk_load(args.rows, not args.no_text_index)
+    elif args.command == "startup":
+        compare_startup(args.rows)
+    elif args.command == "duplicates":
+        compare_duplicate_detection(args.rows, args.processes)
+    elif args.command == "suite":
+        results = run_suite(args.sizes, args.topics, args.difficulties, args.skew, args.storage, args.repeat, args.seed)
+        if args.output:
+            with open(args.output, "w") as file:
+                json.dump(results, file, indent=2)
+        else:
+            json.dump(results, sys.stdout, indent=2)
+            print()
+    elif args.command == "compare":
+        compare_suites(args.baseline, args.candidate)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+import os  # Import os to build paths inside the temporary directory
+import random  # Import random for the mixed sequence of changes in the round-trip test
+import tempfile  # Import tempfile so every test works in its own directory
+import unittest  # Import unittest, which needs nothing beyond the standard library
+
+from DSA1 import ChangeJournal, QuestionBank  # Import the classes under test
+
+class ChangeJournalReplayTest(unittest.TestCase):
+    # Saving through the change journal and loading again must give back exactly the bank that was saved
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, "bank.csv")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def journaled_bank(self, storage):
+        # A bank with one question, saved once so its journal is attached to self.filename
+        bank = QuestionBank(storage=storage, journal=ChangeJournal("always"))
+        bank.add_question(1, "orig text", "T", "3")
+        bank.save_to_file(self.filename)
+        return bank
+
+    def reload(self, storage):
+        bank = QuestionBank(storage=storage)
+        bank.load_from_file(self.filename)
+        return bank
+
+    def test_put_replaces_every_field(self):
+        # Empty fields in a logged add are values of their own, not "keep the current value"
+        for storage in ("dict", "columnar"):
+            bank = self.journaled_bank(storage)
+            bank.add_question(1, "", "", "")
+            bank.save_to_file(self.filename)
+            self.assertEqual(self.reload(storage).questions[1], {'question': "", 'topic': "", 'difficulty': ""})
+
+    def test_crash_between_snapshot_and_journal_truncation(self):
+        # Replaying the old journal over the new snapshot must not change it
+        bank = self.journaled_bank("dict")
+        bank.add_question(2, "second", "U", "1")
+        bank.update_question(1, "changed", "V", "2")
+        bank.add_question(1, "", "", "")
+        bank.delete_question(2)
+        bank.journal.flush()
+        bank._write_snapshot(self.filename)  # The first half of compact; the journal still holds every record
+        self.assertEqual(dict(self.reload("dict").questions), dict(bank.questions))
+
+    def test_torn_last_record_is_ignored(self):
+        bank = self.journaled_bank("dict")
+        bank.add_question(2, "second", "U", "1")
+        bank.save_to_file(self.filename)
+        with open(ChangeJournal.path_for(self.filename), 'ab') as file:
+            file.write(b'{"op": "put", "id": 3, "quest')  # A write cut short by a crash
+        reloaded = QuestionBank(journal=ChangeJournal("always"))
+        reloaded.load_from_file(self.filename)
+        self.assertEqual(dict(reloaded.questions), dict(bank.questions))
+        reloaded.add_question(4, "after the crash", "W", "5")  # New records must start on a clean line
+        reloaded.save_to_file(self.filename)
+        self.assertEqual(dict(self.reload("dict").questions), dict(reloaded.questions))
+
+    def test_round_trip_with_compaction(self):
+        # Random changes saved through the journal, with compaction forced part of the way through
+        rng = random.Random(0)
+        for storage in ("dict", "columnar"):
+            bank = QuestionBank(storage=storage, journal=ChangeJournal("batch", batch_size=7, compact_min=50))
+            bank.save_to_file(self.filename)
+            for step in range(400):
+                question_id = rng.randrange(1, 40)
+                action = rng.random()
+                if action < 0.5:
+                    bank.add_question(question_id, rng.choice(["", f"text {step}"]), rng.choice(["A", "B"]), str(rng.randrange(1, 4)))
+                elif action < 0.8 and question_id in bank.questions:
+                    bank.update_question(question_id, f"edit {step}")
+                elif question_id in bank.questions:
+                    bank.delete_question(question_id)
+                if step % 50 == 0:
+                    bank.save_to_file(self.filename)
+            bank.save_to_file(self.filename)
+            self.assertEqual(dict(self.reload(storage).questions), dict(bank.questions))
+
+if __name__ == "__main__":
+    unittest.main()